@@ -4,22 +4,47 @@ Erweiterter Kryptowährungs-Daten-Agent
 Fokus auf JSON-Verarbeitung und Datenanalyse
 """
 
-import requests
 import json
+import csv
 import time
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-import pandas as pd
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
+from agentceli_utils import HTTP_ERRORS, create_http_session, dump_json_pretty, load_json
+
+class RateLimiter:
+    """Thread-sicherer Taktgeber: höchstens ein Request pro `interval` Sekunden"""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_allowed = 0.0
+    
+    def acquire(self):
+        """Blockiert, bis der nächste Request-Slot frei ist"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_allowed - now
+            self._next_allowed = max(now, self._next_allowed) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
 class AdvancedCryptoAgent:
     def __init__(self, config_file: str = "config.json"):
         self.config = self.load_config(config_file)
         self.base_url = self.config["api_settings"]["base_url"]
         self.rate_limit = self.config["api_settings"]["rate_limit_delay"]
+        self.rate_limiter = RateLimiter(self.rate_limit)
         
-        self.session = requests.Session()
+        # Vorberechnete URLs je Endpoint und Parameter je Datum
+        self._url_cache = {}
+        self._history_params = {}
+        
+        self.session = create_http_session()
         self.session.headers.update({
             'accept': 'application/json',
             'User-Agent': 'AdvancedCryptoAgent/2.0'
@@ -28,12 +53,14 @@ class AdvancedCryptoAgent:
         # Erstelle Ausgabeordner
         self.output_dir = Path("crypto_data")
         self.output_dir.mkdir(exist_ok=True)
+        # Einmal auflösen - Dateipfade entstehen danach per String-Verkettung
+        self._out_dir_str = str(self.output_dir.resolve()) + os.sep
         
     def load_config(self, config_file: str) -> Dict:
         """Lädt Konfiguration aus JSON-Datei"""
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(config_file, 'rb') as f:
+                return load_json(f.read())
         except FileNotFoundError:
             print(f"⚠️ Konfigurationsdatei {config_file} nicht gefunden. Verwende Standardwerte.")
             return self.get_default_config()
@@ -60,28 +87,39 @@ class AdvancedCryptoAgent:
     
     def fetch_json_data(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
         """Generische Methode zum Abrufen von JSON-Daten"""
+        json_data, _ = self.fetch_json_with_raw(endpoint, params)
+        return json_data
+    
+    def fetch_json_with_raw(self, endpoint: str, params: Dict = None) -> Tuple[Optional[Dict], bytes]:
+        """Ruft JSON-Daten ab und liefert zusätzlich den rohen Response-Body"""
         try:
-            url = f"{self.base_url}/{endpoint}"
-            response = self.session.get(url, params=params or {})
+            url = self._url_cache.get(endpoint)
+            if url is None:
+                url = self._url_cache.setdefault(endpoint, f"{self.base_url}/{endpoint}")
+            self.rate_limiter.acquire()
+            response = self.session.get(url, params=params)
             response.raise_for_status()
             
-            json_data = response.json()
+            raw_bytes = response.content
+            json_data = load_json(raw_bytes)
             print(f"✅ JSON-Daten von {endpoint} erfolgreich abgerufen")
-            return json_data
+            return json_data, raw_bytes
             
-        except requests.RequestException as e:
+        except HTTP_ERRORS as e:
             print(f"❌ Fehler beim Abrufen von {endpoint}: {e}")
-            return None
+            return None, b""
         except json.JSONDecodeError as e:
             print(f"❌ JSON-Parsing-Fehler: {e}")
-            return None
+            return None, b""
     
-    def process_historical_json(self, coin_id: str, date: str) -> Optional[Dict]:
+    def process_historical_json(self, coin_id: str, date: str, processed_at: str = None) -> Optional[Dict]:
         """Verarbeitet historische JSON-Daten für einen Coin"""
         endpoint = f"coins/{coin_id}/history"
-        params = {"date": date, "localization": "false"}
+        params = self._history_params.get(date)
+        if params is None:
+            params = self._history_params.setdefault(date, {"date": date, "localization": "false"})
         
-        raw_data = self.fetch_json_data(endpoint, params)
+        raw_data, raw_bytes = self.fetch_json_with_raw(endpoint, params)
         if not raw_data:
             return None
         
@@ -92,13 +130,13 @@ class AdvancedCryptoAgent:
                 "symbol": raw_data.get("symbol", "").upper(),
                 "name": raw_data.get("name"),
                 "date": date,
-                "processed_at": datetime.now().isoformat(),
+                "processed_at": processed_at or datetime.now().isoformat(),
                 "data_source": "coingecko_api"
             },
             "market_data": self.extract_market_data(raw_data),
             "community_data": self.extract_community_data(raw_data),
             "developer_data": self.extract_developer_data(raw_data),
-            "raw_json_size": len(json.dumps(raw_data))
+            "raw_json_size": len(raw_bytes)
         }
         
         # Speichere sowohl Roh- als auch verarbeitete Daten
@@ -112,21 +150,25 @@ class AdvancedCryptoAgent:
     
     def extract_market_data(self, raw_json: Dict) -> Dict:
         """Extrahiert Marktdaten aus rohen JSON-Daten"""
-        market_data = raw_json.get("market_data", {})
+        market_data = raw_json.get("market_data") or {}
+        # Unter-Dicts einmal auflösen statt pro Feld
+        current_price = market_data.get("current_price") or {}
+        market_cap = market_data.get("market_cap") or {}
+        total_volume = market_data.get("total_volume") or {}
         
         return {
             "current_price": {
-                "usd": market_data.get("current_price", {}).get("usd"),
-                "eur": market_data.get("current_price", {}).get("eur"),
-                "btc": market_data.get("current_price", {}).get("btc")
+                "usd": current_price.get("usd"),
+                "eur": current_price.get("eur"),
+                "btc": current_price.get("btc")
             },
             "market_cap": {
-                "usd": market_data.get("market_cap", {}).get("usd"),
-                "eur": market_data.get("market_cap", {}).get("eur")
+                "usd": market_cap.get("usd"),
+                "eur": market_cap.get("eur")
             },
             "total_volume": {
-                "usd": market_data.get("total_volume", {}).get("usd"),
-                "eur": market_data.get("total_volume", {}).get("eur")
+                "usd": total_volume.get("usd"),
+                "eur": total_volume.get("eur")
             },
             "market_cap_rank": raw_json.get("market_cap_rank"),
             "coingecko_rank": raw_json.get("coingecko_rank"),
@@ -135,7 +177,7 @@ class AdvancedCryptoAgent:
     
     def extract_community_data(self, raw_json: Dict) -> Dict:
         """Extrahiert Community-Daten aus JSON"""
-        community_data = raw_json.get("community_data", {})
+        community_data = raw_json.get("community_data") or {}
         
         return {
             "reddit_subscribers": community_data.get("reddit_subscribers"),
@@ -147,7 +189,7 @@ class AdvancedCryptoAgent:
     
     def extract_developer_data(self, raw_json: Dict) -> Dict:
         """Extrahiert Entwickler-Daten aus JSON"""
-        dev_data = raw_json.get("developer_data", {})
+        dev_data = raw_json.get("developer_data") or {}
         
         return {
             "github_forks": dev_data.get("forks"),
@@ -160,20 +202,20 @@ class AdvancedCryptoAgent:
     
     def save_json(self, data: Dict, filename: str):
         """Speichert JSON-Daten mit schöner Formatierung"""
-        filepath = self.output_dir / filename
+        filepath = self._out_dir_str + filename
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, sort_keys=True)
+            with open(filepath, 'wb') as f:
+                f.write(dump_json_pretty(data, sort_keys=True))
             print(f"💾 JSON gespeichert: {filepath}")
         except Exception as e:
             print(f"❌ Fehler beim Speichern von {filename}: {e}")
     
-    def create_summary_json(self, processed_data_list: List[Dict]) -> Dict:
+    def create_summary_json(self, processed_data_list: List[Dict], generated_at: str = None) -> Dict:
         """Erstellt eine Zusammenfassung aller verarbeiteten Daten"""
         summary = {
             "summary_metadata": {
                 "total_coins": len(processed_data_list),
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": generated_at or datetime.now().isoformat(),
                 "agent_version": "2.0"
             },
             "coins_overview": [],
@@ -184,31 +226,42 @@ class AdvancedCryptoAgent:
             }
         }
         
+        coins_overview = summary["coins_overview"]
+        total_market_cap = 0
+        total_volume = 0
         total_price = 0
         valid_prices = 0
         
         for data in processed_data_list:
-            coin_overview = {
-                "coin_id": data["metadata"]["coin_id"],
-                "symbol": data["metadata"]["symbol"],
-                "name": data["metadata"]["name"],
-                "price_usd": data["market_data"]["current_price"]["usd"],
-                "market_cap_usd": data["market_data"]["market_cap"]["usd"],
-                "volume_usd": data["market_data"]["total_volume"]["usd"]
-            }
-            summary["coins_overview"].append(coin_overview)
+            metadata = data["metadata"]
+            market_data = data["market_data"]
+            price_usd = market_data["current_price"]["usd"]
+            market_cap_usd = market_data["market_cap"]["usd"]
+            volume_usd = market_data["total_volume"]["usd"]
+            
+            coins_overview.append({
+                "coin_id": metadata["coin_id"],
+                "symbol": metadata["symbol"],
+                "name": metadata["name"],
+                "price_usd": price_usd,
+                "market_cap_usd": market_cap_usd,
+                "volume_usd": volume_usd
+            })
             
             # Berechne Gesamtwerte
-            if coin_overview["market_cap_usd"]:
-                summary["market_summary"]["total_market_cap_usd"] += coin_overview["market_cap_usd"]
-            if coin_overview["volume_usd"]:
-                summary["market_summary"]["total_volume_usd"] += coin_overview["volume_usd"]
-            if coin_overview["price_usd"]:
-                total_price += coin_overview["price_usd"]
+            if market_cap_usd:
+                total_market_cap += market_cap_usd
+            if volume_usd:
+                total_volume += volume_usd
+            if price_usd:
+                total_price += price_usd
                 valid_prices += 1
         
+        market_summary = summary["market_summary"]
+        market_summary["total_market_cap_usd"] = total_market_cap
+        market_summary["total_volume_usd"] = total_volume
         if valid_prices > 0:
-            summary["market_summary"]["average_price_usd"] = total_price / valid_prices
+            market_summary["average_price_usd"] = total_price / valid_prices
         
         return summary
     
@@ -222,21 +275,24 @@ class AdvancedCryptoAgent:
         
         processed_data_list = []
         target_coins = self.config["target_coins"]
+        # Ein Zeitstempel für den gesamten Batch
+        batch_ts = datetime.now().isoformat()
         
-        for i, coin_config in enumerate(target_coins):
+        def process_coin(indexed_coin):
+            i, coin_config = indexed_coin
             coin_id = coin_config["id"]
             print(f"🔄 [{i+1}/{len(target_coins)}] Verarbeite {coin_config['name']} ({coin_id})")
-            
-            # Rate limiting
-            if i > 0:
-                time.sleep(self.rate_limit)
-            
-            processed_data = self.process_historical_json(coin_id, date)
-            if processed_data:
-                processed_data_list.append(processed_data)
+            return self.process_historical_json(coin_id, date, processed_at=batch_ts)
+        
+        # Parallele Abrufe - das Rate Limiting übernimmt self.rate_limiter
+        if target_coins:
+            with ThreadPoolExecutor(max_workers=min(8, len(target_coins))) as executor:
+                for processed_data in executor.map(process_coin, enumerate(target_coins)):
+                    if processed_data:
+                        processed_data_list.append(processed_data)
         
         # Erstelle Zusammenfassung
-        summary = self.create_summary_json(processed_data_list)
+        summary = self.create_summary_json(processed_data_list, generated_at=batch_ts)
         self.save_json(summary, f"summary_{date.replace('-', '_')}.json")
         
         # Erstelle CSV wenn gewünscht
@@ -266,9 +322,15 @@ class AdvancedCryptoAgent:
                 }
                 rows.append(row)
             
-            df = pd.DataFrame(rows)
-            csv_path = self.output_dir / f"crypto_data_{date.replace('-', '_')}.csv"
-            df.to_csv(csv_path, index=False)
+            if not rows:
+                print("⚠️ Keine Daten für CSV-Export")
+                return
+            
+            csv_path = f"{self._out_dir_str}crypto_data_{date.replace('-', '_')}.csv"
+            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+                writer.writeheader()
+                writer.writerows(rows)
             print(f"📊 CSV exportiert: {csv_path}")
             
         except Exception as e:
@@ -286,7 +348,7 @@ def main():
     print(f"Gesamte Marktkapitalisierung: ${summary['market_summary']['total_market_cap_usd']:,.2f}")
     print(f"Gesamtes Handelsvolumen: ${summary['market_summary']['total_volume_usd']:,.2f}")
     
-    print(f"\n📁 Alle Dateien gespeichert in: {Path('crypto_data').absolute()}")
+    print(f"\n📁 Alle Dateien gespeichert in: {agent._out_dir_str}")
 
 if __name__ == "__main__":
     main()
@@ -93,14 +93,22 @@ class AgentCeliController:
             script = "agentceli_free.py"
         
         try:
-            # Start AgentCeli in background
-            process = subprocess.Popen([
-                sys.executable, script
-            ], 
-            cwd=self.base_dir,
-            stdout=open(self.log_file, 'a'),
-            stderr=subprocess.STDOUT
-            )
+            # Reap a previous child that exited on its own (watchdog runs us in-process)
+            try:
+                self._wait_for_exit(int(self.pid_file.read_text().strip()), 0)
+            except (OSError, ValueError):
+                pass
+            
+            # Start AgentCeli in background; the child keeps its own copy of the log handle
+            with open(self.log_file, 'a') as log:
+                process = subprocess.Popen([
+                    sys.executable, script
+                ], 
+                cwd=self.base_dir,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True
+                )
             
             # Save PID
             with open(self.pid_file, 'w') as f:
@@ -143,13 +151,14 @@ class AgentCeliController:
                 with open(self.pid_file) as f:
                     pid = int(f.read().strip())
                 os.kill(pid, 15)  # SIGTERM
-                time.sleep(1)
                 
                 # Force kill if necessary
-                try:
-                    os.kill(pid, 9)  # SIGKILL
-                except ProcessLookupError:
-                    pass
+                if not self._wait_for_exit(pid, 5):
+                    try:
+                        os.kill(pid, 9)  # SIGKILL
+                    except ProcessLookupError:
+                        pass
+                    self._wait_for_exit(pid, 5)
                     
                 self.pid_file.unlink()
                 print("✅ AgentCeli stopped")
@@ -160,6 +169,25 @@ class AgentCeliController:
         
         return not self.is_running()
     
+    def _wait_for_exit(self, pid, timeout):
+        """Wait until pid has exited, reaping it if it is our own child"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if os.waitpid(pid, os.WNOHANG)[0]:
+                    return True
+            except ChildProcessError:
+                # Not our child (started from another process) - just check it is gone
+                try:
+                    os.kill(pid, 0)
+                except ProcessLookupError:
+                    return True
+                except PermissionError:
+                    pass  # PID exists but belongs to another user
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.1)
+    
     def restart(self):
         """Restart AgentCeli system"""
         print("🔄 Restarting AgentCeli...")
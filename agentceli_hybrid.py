@@ -4,15 +4,18 @@ AgentCeli Hybrid - Configurable Free + Paid APIs
 Start free, upgrade when budget allows
 """
 
-from flask import Flask, jsonify, send_file
+from flask import Flask, jsonify, send_file, request, Response
 import sqlite3
 import json
+import hashlib
 import csv
 import threading
+import queue
 import time
-import requests
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import MappingProxyType
+from urllib.parse import urlencode
 
 # Import Santiment module
 try:
@@ -22,6 +25,38 @@ except ImportError:
     SANTIMENT_AVAILABLE = False
     print("⚠️ Santiment module not available")
 
+from agentceli_utils import create_http_session, dump_json, dump_json_pretty, load_json
+
+# Optional fast JSON parser: simdjson > orjson > stdlib json
+try:
+    import simdjson
+    _simdjson_parser = simdjson.Parser()  # Reused - parser setup is the expensive part
+except ImportError:
+    _simdjson_parser = None
+
+def parse_json(content, lazy=False):
+    """Parse a JSON response body (lazy=True may return a simdjson proxy)"""
+    # A lazy proxy is only valid until the next parse - extract fields first
+    if _simdjson_parser is not None:
+        return _simdjson_parser.parse(content, recursive=not lazy)
+    return load_json(content)
+
+# Days of rotated hybrid_events.jsonl files kept, same window as the bridge's history
+EVENTS_RETENTION_DAYS = 7
+
+# Binance pairs tracked by the hybrid collector
+MAIN_PAIRS = frozenset({'BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'XRPUSDT'})
+# Binance expects a JSON array string, e.g. symbols=["BTCUSDT","ETHUSDT"]
+BINANCE_SYMBOLS_PARAM = json.dumps(sorted(MAIN_PAIRS), separators=(',', ':'))
+
+# Static query - encoded once instead of on every request
+COINGECKO_SIMPLE_PRICE_URL = "https://api.coingecko.com/api/v3/simple/price?" + urlencode({
+    'ids': 'bitcoin,ethereum,solana,ripple',
+    'vs_currencies': 'usd',
+    'include_24hr_change': 'true',
+    'include_market_cap': 'true'
+}, safe=',')
+
 class AgentCeliHybrid:
     def __init__(self, config=None):
         """Initialize with configurable API tiers"""
@@ -39,6 +74,7 @@ class AgentCeliHybrid:
         self.setup_directories()
         self.setup_database()
         self.setup_sessions()
+        self.setup_writer()
         
         # Flask API
         self.app = Flask(__name__)
@@ -47,6 +83,13 @@ class AgentCeliHybrid:
         # Data storage
         self.collected_data = {}
         self.last_update = None
+        # Published atomically for the API handlers - see publish_snapshot()
+        self._snapshot = MappingProxyType({
+            'data': MappingProxyType({}),
+            'last_update': None,
+            'prices_body': None,
+            'prices_etag': None
+        })
         self.is_running = False
         
         print("✅ AgentCeli Hybrid ready!")
@@ -165,12 +208,19 @@ class AgentCeliHybrid:
     def setup_database(self):
         """Setup SQLite database"""
         self.db_path = self.correlation_dir / "hybrid_crypto_data.db"
-        conn = sqlite3.connect(self.db_path)
+        # Long-lived connection shared by the initial and background collections
+        self._db_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        conn = self._db_conn
         cursor = conn.cursor()
         
+        # WAL lets readers (dashboards, bridges) query while we write
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS live_prices (
-                timestamp TEXT,
+                timestamp INTEGER NOT NULL,
                 symbol TEXT,
                 price_usd REAL,
                 volume_24h REAL,
@@ -180,13 +230,88 @@ class AgentCeliHybrid:
                 fear_greed INTEGER
             )
         ''')
+        self.migrate_epoch_timestamps(cursor)
+        
+        # Serve the bridge's per-symbol and all-symbol history window queries
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_live_prices_symbol_ts ON live_prices(symbol, timestamp DESC)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_live_prices_ts ON live_prices(timestamp)')
+        cursor.execute('ANALYZE')
         
         conn.commit()
-        conn.close()
+    
+    def migrate_epoch_timestamps(self, cursor):
+        """Convert a legacy ISO-text timestamp column to unix seconds"""
+        columns = {row[1]: row[2] for row in cursor.execute('PRAGMA table_info(live_prices)')}
+        legacy = columns.get('timestamp', '').upper() == 'TEXT'
+        # An interrupted migration from before it ran in a transaction left its copy behind
+        leftover = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='live_prices_text'"
+        ).fetchone() is not None
+        if not legacy and not leftover:
+            return
+        
+        # One transaction - a crash midway rolls back to the untouched table
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            if legacy:
+                if leftover:
+                    cursor.execute('INSERT INTO live_prices_text SELECT * FROM live_prices')
+                    cursor.execute('DROP TABLE live_prices')
+                else:
+                    cursor.execute('ALTER TABLE live_prices RENAME TO live_prices_text')
+                cursor.execute('''
+                    CREATE TABLE live_prices (
+                        timestamp INTEGER NOT NULL,
+                        symbol TEXT,
+                        price_usd REAL,
+                        volume_24h REAL,
+                        change_24h REAL,
+                        exchange TEXT,
+                        api_tier TEXT,
+                        fear_greed INTEGER
+                    )
+                ''')
+            # Timestamps were written as naive local time; digit strings are already epoch
+            cursor.execute('''
+                INSERT INTO live_prices
+                SELECT CASE WHEN CAST(timestamp AS INTEGER) || '' = timestamp
+                            THEN CAST(timestamp AS INTEGER)
+                            ELSE CAST(strftime('%s', timestamp, 'utc') AS INTEGER) END,
+                       symbol, price_usd, volume_24h, change_24h, exchange, api_tier, fear_greed
+                FROM live_prices_text
+                WHERE timestamp IS NOT NULL
+            ''')
+            cursor.execute('DROP TABLE live_prices_text')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+        cursor.execute('COMMIT')
+        print("📊 Migrated live_prices timestamps to unix seconds")
+    
+    def setup_writer(self):
+        """Start the background writer for files and database"""
+        # Disk writes overlap with the collection sleep instead of delaying it
+        self._write_q = queue.Queue(maxsize=4)
+        self._last_written = None
+        self._last_written_hash = None
+        self._writer_thread = threading.Thread(target=self.writer_loop, daemon=True)
+        self._writer_thread.start()
+    
+    def writer_loop(self):
+        """Drain queued snapshots to files and database"""
+        while True:
+            data = self._write_q.get()
+            try:
+                self.save_to_files(data)
+                self.save_to_database(data)
+            except Exception as e:
+                print(f"❌ Write error: {e}")
+            finally:
+                self._write_q.task_done()
     
     def setup_sessions(self):
         """Setup HTTP sessions for APIs"""
-        self.session = requests.Session()
+        self.session = create_http_session()
         self.session.headers.update({
             'User-Agent': 'AgentCeli-Hybrid/1.0'
         })
@@ -199,10 +324,10 @@ class AgentCeliHybrid:
             if key:
                 self.session.headers['x-cg-demo-api-key'] = key
     
-    def collect_free_data(self):
+    def collect_free_data(self, timestamp=None):
         """Collect data from free APIs"""
         data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp or datetime.now().isoformat(),
             'api_tier': 'FREE',
             'sources': {},
             'live_prices': {}
@@ -290,23 +415,22 @@ class AgentCeliHybrid:
         """Get live data from Binance (always free)"""
         try:
             url = "https://api.binance.com/api/v3/ticker/24hr"
-            response = self.session.get(url, timeout=10)
+            # Only request the tracked pairs instead of the full ticker dump
+            params = {'symbols': BINANCE_SYMBOLS_PARAM}
+            response = self.session.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
-                
-                # Filter main coins
-                main_pairs = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'XRPUSDT']
-                filtered = {}
+                data = parse_json(response.content, lazy=True)
                 
-                for ticker in data:
-                    if ticker['symbol'] in main_pairs:
-                        filtered[ticker['symbol']] = {
-                            'price': float(ticker['lastPrice']),
-                            'volume_24h': float(ticker['volume']),
-                            'change_24h': float(ticker['priceChangePercent']),
-                            'source': 'binance_free'
-                        }
+                filtered = {
+                    ticker['symbol']: {
+                        'price': float(ticker['lastPrice']),
+                        'volume_24h': float(ticker['volume']),
+                        'change_24h': float(ticker['priceChangePercent']),
+                        'source': 'binance_free'
+                    }
+                    for ticker in data
+                }
                 
                 print(f"✅ Binance: {len(filtered)} pairs collected")
                 return filtered
@@ -319,18 +443,10 @@ class AgentCeliHybrid:
     def get_coingecko_free(self):
         """Get CoinGecko free tier data"""
         try:
-            url = "https://api.coingecko.com/api/v3/simple/price"
-            params = {
-                'ids': 'bitcoin,ethereum,solana,ripple',
-                'vs_currencies': 'usd',
-                'include_24hr_change': 'true',
-                'include_market_cap': 'true'
-            }
-            
-            response = self.session.get(url, params=params, timeout=10)
+            response = self.session.get(COINGECKO_SIMPLE_PRICE_URL, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = parse_json(response.content)
                 print(f"✅ CoinGecko Free: {len(data)} coins collected")
                 return data
         
@@ -343,10 +459,10 @@ class AgentCeliHybrid:
         """Get Fear & Greed Index (always free)"""
         try:
             url = "https://api.alternative.me/fng/"
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = parse_json(response.content)
                 if data and 'data' in data:
                     fg_data = data['data'][0]
                     print(f"✅ Fear & Greed: {fg_data.get('value')} ({fg_data.get('value_classification')})")
@@ -407,10 +523,12 @@ class AgentCeliHybrid:
     
     def collect_all_data(self):
         """Main data collection - combines free + paid"""
-        print(f"🐙 Hybrid data collection at {datetime.now().strftime('%H:%M:%S')}")
+        # One timestamp per cycle, shared by files, database and status
+        collection_time = datetime.now()
+        print(f"🐙 Hybrid data collection at {collection_time.strftime('%H:%M:%S')}")
         
         # Always collect free data
-        free_data = self.collect_free_data()
+        free_data = self.collect_free_data(timestamp=collection_time.isoformat())
         
         # Collect paid data if enabled
         paid_data = self.collect_paid_data()
@@ -432,22 +550,27 @@ class AgentCeliHybrid:
             }
         }
         
-        # Save for correlation systems
-        self.save_to_files()
-        self.save_to_database()
+        # Save for correlation systems (handled by the writer thread)
+        try:
+            self._write_q.put_nowait(self.collected_data)
+        except queue.Full:
+            print("⚠️ Writer backlog full - skipping file/database save for this cycle")
         
-        self.last_update = datetime.now()
+        self.last_update = collection_time
+        self.publish_snapshot()
         
         total_sources = self.collected_data['total_sources']
         cost = self.collected_data['cost_estimate']
         print(f"✅ Hybrid collection complete: {total_sources} sources, ~${cost}/month")
     
-    def save_to_files(self):
+    def save_to_files(self, collected_data=None):
         """Save to files for correlation systems"""
-        if not self.collected_data:
+        if collected_data is None:
+            collected_data = self.collected_data
+        if not collected_data:
             return
         
-        timestamp = datetime.now()
+        timestamp = collected_data['timestamp']
         
         # Save latest CSV
         csv_file = self.correlation_dir / "hybrid_latest.csv"
@@ -455,13 +578,13 @@ class AgentCeliHybrid:
             writer = csv.writer(f)
             writer.writerow(['timestamp', 'symbol', 'price', 'volume', 'change', 'api_tier', 'fear_greed'])
             
-            binance_data = self.collected_data.get('live_prices', {}).get('binance', {})
-            fear_greed = self.collected_data.get('fear_greed', {}).get('value', 0)
+            binance_data = collected_data.get('live_prices', {}).get('binance', {})
+            fear_greed = collected_data.get('fear_greed', {}).get('value', 0)
             
             for pair, data in binance_data.items():
                 symbol = pair.replace('USDT', '')
                 writer.writerow([
-                    timestamp.isoformat(),
+                    timestamp,
                     symbol,
                     data['price'],
                     data['volume_24h'],
@@ -470,69 +593,140 @@ class AgentCeliHybrid:
                     fear_greed
                 ])
         
-        # Save JSON
+        # Save JSON only if something besides the timestamp changed
+        content = {k: v for k, v in collected_data.items() if k != 'timestamp'}
+        content_hash = hashlib.blake2b(dump_json(content), digest_size=8).digest()
+        if content_hash == self._last_written_hash:
+            print("📊 CSV saved, JSON unchanged")
+            return
+        
         json_file = self.correlation_dir / "hybrid_latest.json"
-        with open(json_file, 'w') as f:
-            json.dump(self.collected_data, f, indent=2)
+        with open(json_file, 'wb') as f:
+            f.write(dump_json_pretty(collected_data))
+        
+        # Change log for tailing consumers - one line per changed snapshot
+        previous = self._last_written or {}
+        changed = [k for k in content.keys() | previous.keys() if content.get(k) != previous.get(k)]
+        event = {'timestamp': timestamp, 'changed': sorted(changed)}
+        self.append_event(event)
         
+        self._last_written = content
+        self._last_written_hash = content_hash
         print("📊 Files saved for correlation systems")
     
-    def save_to_database(self):
+    def append_event(self, event):
+        """Append to hybrid_events.jsonl, rotating it daily and keeping EVENTS_RETENTION_DAYS"""
+        events_file = self.correlation_dir / "hybrid_events.jsonl"
+        try:
+            last_day = datetime.fromtimestamp(events_file.stat().st_mtime).date()
+        except FileNotFoundError:
+            last_day = None
+        
+        # First event of a new day: move yesterday's file aside (tail -F follows the rename)
+        if last_day is not None and last_day != datetime.now().date():
+            events_file.rename(self.correlation_dir / f"hybrid_events.{last_day:%Y%m%d}.jsonl")
+            cutoff = f"{datetime.now().date() - timedelta(days=EVENTS_RETENTION_DAYS):%Y%m%d}"
+            for rotated in self.correlation_dir.glob("hybrid_events.*.jsonl"):
+                if rotated.name.split('.')[1] < cutoff:
+                    rotated.unlink()
+        
+        with open(events_file, 'ab') as f:
+            f.write(dump_json(event) + b'\n')
+    
+    def save_to_database(self, collected_data=None):
         """Save to database"""
-        if not self.collected_data:
+        if collected_data is None:
+            collected_data = self.collected_data
+        if not collected_data:
             return
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # Integer epoch keeps the history window filter a plain index range scan
+        ts_epoch = int(datetime.fromisoformat(collected_data['timestamp']).timestamp())
+        fear_greed = collected_data.get('fear_greed', {}).get('value')
         
-        timestamp = self.collected_data['timestamp']
-        fear_greed = self.collected_data.get('fear_greed', {}).get('value')
+        binance_data = collected_data.get('live_prices', {}).get('binance', {})
         
-        binance_data = self.collected_data.get('live_prices', {}).get('binance', {})
+        rows = [
+            (ts_epoch, pair.replace('USDT', ''), data['price'], data['volume_24h'],
+             data['change_24h'], 'binance', 'FREE', fear_greed)
+            for pair, data in binance_data.items()
+        ]
         
-        for pair, data in binance_data.items():
-            symbol = pair.replace('USDT', '')
-            cursor.execute('''
-                INSERT INTO live_prices 
+        # One transaction (and one fsync) per batch
+        with self._db_lock, self._db_conn:
+            self._db_conn.executemany('''
+                INSERT INTO live_prices
                 (timestamp, symbol, price_usd, volume_24h, change_24h, exchange, api_tier, fear_greed)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                timestamp, symbol, data['price'], data['volume_24h'], 
-                data['change_24h'], 'binance', 'FREE', fear_greed
-            ))
+            ''', rows)
         
-        conn.commit()
-        conn.close()
         print("💾 Database updated")
     
+    def publish_snapshot(self):
+        """Publish collected data and the pre-serialized /api/prices body"""
+        data = self.collected_data
+        binance_data = data.get('live_prices', {}).get('binance', {})
+        
+        # Serialized once per collection cycle instead of once per request
+        prices_body = dump_json({
+            'timestamp': data['timestamp'],
+            'api_tier': data['api_tier'],
+            'btc': binance_data.get('BTCUSDT', {}).get('price', 0),
+            'eth': binance_data.get('ETHUSDT', {}).get('price', 0),
+            'sol': binance_data.get('SOLUSDT', {}).get('price', 0),
+            'xrp': binance_data.get('XRPUSDT', {}).get('price', 0),
+            'fear_greed': data.get('fear_greed', {}).get('value'),
+            'cost_estimate': data.get('cost_estimate', 0)
+        })
+        
+        # Single reference assignment - handlers never see a half-updated state
+        self._snapshot = MappingProxyType({
+            'data': MappingProxyType(data),
+            'last_update': self.last_update,
+            'prices_body': prices_body,
+            'prices_etag': hashlib.sha1(prices_body).hexdigest()
+        })
+    
     def setup_api(self):
         """Setup HTTP API for websites"""
         
         @self.app.route('/api/status')
         def status():
+            snap = self._snapshot
+            data = snap['data']
+            last_update = snap['last_update']
             return jsonify({
                 'status': 'hybrid_active',
-                'configuration': self.collected_data.get('configuration', {}),
-                'cost_estimate': self.collected_data.get('cost_estimate', 0),
-                'last_update': self.last_update.isoformat() if self.last_update else None
+                'configuration': data.get('configuration', {}),
+                'cost_estimate': data.get('cost_estimate', 0),
+                'last_update': last_update.isoformat() if last_update else None
             })
         
         @self.app.route('/api/prices')
         def get_prices():
-            if not self.collected_data:
+            snap = self._snapshot
+            if snap['prices_body'] is None:
                 return jsonify({'error': 'No data'}), 404
             
-            binance_data = self.collected_data.get('live_prices', {}).get('binance', {})
+            # Repeat polls with a matching If-None-Match get an empty 304
+            response = Response(snap['prices_body'], mimetype='application/json')
+            response.set_etag(snap['prices_etag'])
+            return response.make_conditional(request)
+        
+        @self.app.route('/api/aggregate/dashboard')
+        def aggregate_dashboard():
+            # Everything the monitoring dashboard used to fetch from three upstream APIs
+            snap = self._snapshot
+            data = snap['data']
+            if not data:
+                return jsonify({'error': 'No data'}), 404
             
+            sources = data.get('sources', {})
             return jsonify({
-                'timestamp': self.collected_data['timestamp'],
-                'api_tier': self.collected_data['api_tier'],
-                'btc': binance_data.get('BTCUSDT', {}).get('price', 0),
-                'eth': binance_data.get('ETHUSDT', {}).get('price', 0),
-                'sol': binance_data.get('SOLUSDT', {}).get('price', 0),
-                'xrp': binance_data.get('XRPUSDT', {}).get('price', 0),
-                'fear_greed': self.collected_data.get('fear_greed', {}).get('value'),
-                'cost_estimate': self.collected_data.get('cost_estimate', 0)
+                'timestamp': data['timestamp'],
+                'binance': sources.get('binance'),
+                'coingecko': sources.get('coingecko'),
+                'fear_greed': data.get('fear_greed')
             })
     
     def upgrade_to_paid(self, api_name, api_key):
@@ -564,10 +758,12 @@ class AgentCeliHybrid:
         print("🌐 API Endpoints:")
         print(f"   GET http://localhost:{port}/api/status")
         print(f"   GET http://localhost:{port}/api/prices")
+        print(f"   GET http://localhost:{port}/api/aggregate/dashboard")
         print()
         print("📊 Correlation Files:")
         print("   correlation_data/hybrid_latest.csv")
         print("   correlation_data/hybrid_latest.json")
+        print("   correlation_data/hybrid_events.jsonl")
         print("   correlation_data/hybrid_crypto_data.db")
         
         # Start collection
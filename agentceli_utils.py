@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+AgentCeli shared helpers - JSON encoding and HTTP sessions for the collectors and servers
+"""
+
+import json
+import requests
+
+# orjson is optional - fall back to the stdlib json without the wheel
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# httpx is optional - multiplexes parallel requests to the same host over HTTP/2
+try:
+    import httpx
+    HTTP_ERRORS = (requests.RequestException, httpx.HTTPError)
+except ImportError:
+    httpx = None
+    HTTP_ERRORS = (requests.RequestException,)
+
+# Flask is only needed by the servers that install the JSON provider
+try:
+    from flask.json.provider import DefaultJSONProvider
+except ImportError:
+    DefaultJSONProvider = None
+
+def load_json(data):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dump_json(data, sort_keys=False):
+    """Serialize to compact UTF-8 JSON bytes (sort_keys=True for stable hashes)"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, sort_keys=sort_keys, separators=(',', ':')).encode('utf-8')
+
+def dump_json_pretty(data, sort_keys=False):
+    """Serialize to indented UTF-8 JSON bytes"""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, indent=2, ensure_ascii=False, sort_keys=sort_keys).encode('utf-8')
+
+def create_http_session():
+    """HTTP/2 httpx client when available, otherwise a requests Session"""
+    if httpx is not None:
+        try:
+            return httpx.Client(http2=True, follow_redirects=True, timeout=10,
+                                limits=httpx.Limits(max_keepalive_connections=10))
+        except ImportError:  # httpx installed without the h2 extra
+            pass
+    return requests.Session()
+
+if orjson is not None and DefaultJSONProvider is not None:
+    class OrjsonProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by orjson"""
+        
+        option = orjson.OPT_NON_STR_KEYS
+        
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default, option=self.option).decode()
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+        
+        def response(self, *args, **kwargs):
+            # Hand the bytes straight to the response, no detour through str
+            obj = self._prepare_response_obj(args, kwargs)
+            body = orjson.dumps(obj, default=self.default, option=self.option)
+            return self._app.response_class(body, mimetype=self.mimetype)
+else:
+    OrjsonProvider = None
@@ -15,6 +15,8 @@ import psutil
 import signal
 import sys
 
+from agentceli_control import AgentCeliController
+
 class AgentCeliWatchdog:
     def __init__(self):
         self.base_dir = Path(__file__).parent
@@ -124,21 +126,14 @@ class AgentCeliWatchdog:
         """Stop all AgentCeli processes"""
         self.log("🛑 Stopping AgentCeli processes...")
         
-        # Try using agentceli_control.py first
+        # Try the AgentCeli controller first (in-process, no interpreter spawn)
         try:
-            result = subprocess.run(
-                ["python3", "agentceli_control.py", "stop"],
-                cwd=self.base_dir,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            if result.returncode == 0:
-                self.log("✅ AgentCeli stopped via control script")
+            if AgentCeliController().stop():
+                self.log("✅ AgentCeli stopped via controller")
                 time.sleep(5)
                 return True
         except Exception as e:
-            self.log(f"⚠️ Control script stop failed: {e}")
+            self.log(f"⚠️ Controller stop failed: {e}")
         
         # Fallback: kill processes manually
         processes = self.get_agentceli_processes()
@@ -162,23 +157,15 @@ class AgentCeliWatchdog:
         self.log("🚀 Starting AgentCeli...")
         
         try:
-            # Try using agentceli_control.py first
-            result = subprocess.run(
-                ["python3", "agentceli_control.py", "start"],
-                cwd=self.base_dir,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            
-            if result.returncode == 0:
-                self.log("✅ AgentCeli started via control script")
+            # Try the AgentCeli controller first (in-process, no interpreter spawn)
+            if AgentCeliController().start():
+                self.log("✅ AgentCeli started via controller")
                 time.sleep(10)  # Give it time to initialize
                 return True
             else:
-                self.log(f"⚠️ Control script failed: {result.stderr}")
+                self.log("⚠️ Controller failed to start AgentCeli")
         except Exception as e:
-            self.log(f"⚠️ Control script start failed: {e}")
+            self.log(f"⚠️ Controller start failed: {e}")
         
         # Fallback: start hybrid directly
         try:
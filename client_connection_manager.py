@@ -10,9 +10,64 @@ import requests
 import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from flask import Flask, jsonify, request
+from typing import Optional
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 import sqlite3
+from agentceli_utils import dump_json, load_json
+
+# msgspec is optional - validates request bodies in one pass when installed
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+REGISTER_REQUIRED_FIELDS = ('client_id', 'name', 'type')
+REGISTER_OPTIONAL_FIELDS = ('endpoint', 'webhook_url', 'api_key')
+
+if msgspec is not None:
+    class RegisterClientRequest(msgspec.Struct):
+        """Body of POST /api/register"""
+        client_id: str
+        name: str
+        type: str
+        endpoint: Optional[str] = None
+        webhook_url: Optional[str] = None
+        api_key: Optional[str] = None
+
+_JSON_TYPE_NAMES = {bool: 'bool', int: 'int', float: 'float', str: 'str', list: 'array', dict: 'object', type(None): 'null'}
+
+def _json_type_name(value):
+    """JSON type name of a decoded value, as msgspec reports it"""
+    return _JSON_TYPE_NAMES.get(type(value), type(value).__name__)
+
+def parse_register_request(body):
+    """Decode and validate a /api/register body - returns (fields, error)"""
+    if msgspec is not None:
+        try:
+            req = msgspec.json.decode(body, type=RegisterClientRequest)
+        except msgspec.ValidationError as e:
+            return None, str(e)
+        except msgspec.DecodeError:
+            return None, 'Invalid JSON'
+        return msgspec.structs.asdict(req), None
+    
+    try:
+        data = load_json(body)
+    except ValueError:
+        return None, 'Invalid JSON'
+    # Same checks and messages as the msgspec Struct, so acceptance does not depend on it
+    if not isinstance(data, dict):
+        return None, f"Expected `object`, got `{_json_type_name(data)}`"
+    for field, value in data.items():
+        if field in REGISTER_REQUIRED_FIELDS and not isinstance(value, str):
+            return None, f"Expected `str`, got `{_json_type_name(value)}` - at `$.{field}`"
+        if field in REGISTER_OPTIONAL_FIELDS and value is not None and not isinstance(value, str):
+            return None, f"Expected `str | null`, got `{_json_type_name(value)}` - at `$.{field}`"
+    for field in REGISTER_REQUIRED_FIELDS:
+        if field not in data:
+            return None, f"Object missing required field `{field}`"
+    return {field: data.get(field) for field in REGISTER_REQUIRED_FIELDS + REGISTER_OPTIONAL_FIELDS}, None
 
 class ClientManager:
     """Manages client connections and data delivery"""
@@ -24,6 +79,11 @@ class ClientManager:
         
         self.clients = {}
         self.delivery_stats = {}
+        # Serialized self.clients for /api/clients, rebuilt after a change;
+        # the version lets a fill that raced a change skip storing stale bytes
+        self._clients_json = None
+        self._clients_version = 0
+        self._clients_json_lock = threading.Lock()
         
         # Initialize database
         self._init_database()
@@ -102,6 +162,7 @@ class ClientManager:
             }
         
         conn.close()
+        self._invalidate_clients_json()
     
     def save_clients(self):
         """Save clients to JSON file (backup)"""
@@ -133,6 +194,7 @@ class ClientManager:
             'created_at': datetime.now().isoformat(),
             'delivery_count': 0
         }
+        self._invalidate_clients_json()
         
         self.save_clients()
         print(f"✅ Registered client: {name} ({client_id})")
@@ -149,6 +211,7 @@ class ClientManager:
         
         if client_id in self.clients:
             del self.clients[client_id]
+            self._invalidate_clients_json()
             self.save_clients()
         
         print(f"✅ Unregistered client: {client_id}")
@@ -217,6 +280,7 @@ class ClientManager:
         if success:
             client['delivery_count'] = client.get('delivery_count', 0) + 1
             client['last_delivery'] = datetime.now().isoformat()
+            self._invalidate_clients_json()
         
         return success
     
@@ -230,6 +294,25 @@ class ClientManager:
         
         return results
     
+    def _invalidate_clients_json(self):
+        """Drop the cached client list after self.clients changed"""
+        with self._clients_json_lock:
+            self._clients_version += 1
+            self._clients_json = None
+    
+    def clients_json(self):
+        """Serialized client list, cached until the clients change"""
+        with self._clients_json_lock:
+            clients_json = self._clients_json
+            version = self._clients_version
+        if clients_json is None:
+            # Serialize outside the lock; store only if no change happened meanwhile
+            clients_json = dump_json(self.clients)
+            with self._clients_json_lock:
+                if self._clients_version == version:
+                    self._clients_json = clients_json
+        return clients_json
+    
     def _log_delivery(self, client_id, data_type, success, response_time, error_msg):
         """Log delivery attempt to database"""
         conn = sqlite3.connect(self.db_file)
@@ -300,11 +383,14 @@ class ClientManager:
         @self.app.route('/api/clients', methods=['GET'])
         def list_clients():
             """List all registered clients"""
-            return jsonify({
-                'clients': self.clients,
-                'total_clients': len(self.clients),
-                'timestamp': datetime.now().isoformat()
-            })
+            # Splice the cached client list in - only the small fields are encoded per request
+            body = b''.join([
+                b'{"clients":', self.clients_json(),
+                b',"total_clients":', str(len(self.clients)).encode(),
+                b',"timestamp":', dump_json(datetime.now().isoformat()),
+                b'}'
+            ])
+            return Response(body, mimetype='application/json')
         
         @self.app.route('/api/clients/<client_id>/stats', methods=['GET'])
         def client_stats(client_id):
@@ -321,11 +407,9 @@ class ClientManager:
         @self.app.route('/api/register', methods=['POST'])
         def register_client_api():
             """Register a new client via API"""
-            data = request.json
-            
-            required_fields = ['client_id', 'name', 'type']
-            if not all(field in data for field in required_fields):
-                return jsonify({'error': 'Missing required fields'}), 400
+            data, error = parse_register_request(request.get_data())
+            if error:
+                return jsonify({'error': error}), 400
             
             success = self.register_client(
                 data['client_id'],
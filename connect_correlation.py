@@ -107,7 +107,7 @@ class CryptoPredictor1h1d3d:
         try:
             conn = sqlite3.connect(self.db_path)
             
-            query = f"""
+            query = """
             SELECT 
                 timestamp,
                 symbol,
@@ -116,11 +116,13 @@ class CryptoPredictor1h1d3d:
                 change_24h,
                 fear_greed
             FROM live_prices 
-            WHERE timestamp > datetime('now', '-{hours} hours')
+            WHERE timestamp > ?
             ORDER BY timestamp ASC
             """
             
-            df = pd.read_sql_query(query, conn)
+            # Timestamps are stored as unix seconds
+            cutoff = int(datetime.now().timestamp()) - hours * 3600
+            df = pd.read_sql_query(query, conn, params=(cutoff,))
             conn.close()
             
             if df.empty:
@@ -128,7 +130,7 @@ class CryptoPredictor1h1d3d:
                 return None
             
             # Convert timestamp
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
             
             # Create features for each symbol
             historical_features = []
@@ -4,7 +4,6 @@ Data Collection Watchdog - Monitors dataset count and shuts down AgentCeli if <
 """
 
 import time
-import subprocess
 import os
 import json
 from datetime import datetime, timedelta
@@ -13,6 +12,8 @@ import psutil
 import signal
 import sys
 
+from agentceli_control import AgentCeliController
+
 class DataCollectionWatchdog:
     def __init__(self):
         self.base_dir = Path(__file__).parent
@@ -141,21 +142,14 @@ class DataCollectionWatchdog:
         """Shutdown all AgentCeli processes"""
         self.log("🛑 SHUTTING DOWN AgentCeli - Dataset threshold exceeded")
         
-        # Try using agentceli_control.py first
+        # Try the AgentCeli controller first (in-process, no interpreter spawn)
         try:
-            result = subprocess.run(
-                ["python3", "agentceli_control.py", "stop"],
-                cwd=self.base_dir,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            if result.returncode == 0:
-                self.log("✅ AgentCeli stopped via control script")
+            if AgentCeliController().stop():
+                self.log("✅ AgentCeli stopped via controller")
                 time.sleep(5)
                 return True
         except Exception as e:
-            self.log(f"⚠️ Control script stop failed: {e}")
+            self.log(f"⚠️ Controller stop failed: {e}")
         
         # Fallback: kill processes manually
         processes = self.get_agentceli_processes()
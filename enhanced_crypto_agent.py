@@ -5,15 +5,98 @@ Sammelt Kryptowährungs-Daten ohne AI-APIs (nur Internet-Zugang erforderlich)
 """
 
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import hashlib
+import os
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
+import numpy as np
 import pandas as pd
 from pathlib import Path
-import schedule
-from flask import Flask, jsonify, render_template_string
+from flask import Flask, Response, render_template_string, request
+from agentceli_utils import dump_json, dump_json_pretty, load_json
+
+# waitress ist optional - ohne Paket läuft der Flask-Server (threaded)
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
+
+# Statische Dashboard-Seite, einmal beim Import kodiert
+_DASHBOARD_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Enhanced Crypto Dashboard</title>
+    <meta charset="utf-8">
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
+        .header { background: #2c3e50; color: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; }
+        .metrics-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 15px; margin-bottom: 20px; }
+        .metric-card { background: white; padding: 15px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .rate-limits { background: #ecf0f1; padding: 15px; border-radius: 8px; margin-bottom: 20px; }
+        .api-status { display: flex; gap: 10px; margin: 10px 0; }
+        .status-badge { padding: 4px 8px; border-radius: 4px; color: white; font-size: 12px; }
+        .active { background: #27ae60; }
+        .limited { background: #f39c12; }
+        .inactive { background: #e74c3c; }
+    </style>
+    <script>
+        function refreshData() {
+            fetch('/api/enhanced')
+                .then(response => response.json())
+                .then(data => updateDashboard(data))
+                .catch(error => console.error('Error:', error));
+        }
+        
+        function updateDashboard(data) {
+            if (data.data) {
+                document.getElementById('last-update').textContent = 
+                    'Letztes Update: ' + new Date(data.last_update).toLocaleString();
+            }
+        }
+        
+        setInterval(refreshData, 60000);
+        window.onload = refreshData;
+    </script>
+</head>
+<body>
+    <div class="header">
+        <h1>📊 Enhanced Crypto Dashboard</h1>
+        <p>Erweiterte Kryptowährungsdaten mit konservativen Rate Limits</p>
+        <div id="last-update">Lade Daten...</div>
+    </div>
+    
+    <div class="rate-limits">
+        <h3>🚦 API Rate Limit Status</h3>
+        <div id="rate-status">Lade Status...</div>
+    </div>
+    
+    <div class="metrics-grid">
+        <div class="metric-card">
+            <h4>💰 Marktkapitalisierung</h4>
+            <div id="market-cap">-</div>
+        </div>
+        <div class="metric-card">
+            <h4>😨 Fear & Greed Index</h4>
+            <div id="fear-greed">-</div>
+        </div>
+        <div class="metric-card">
+            <h4>💧 Liquidationen (24h)</h4>
+            <div id="liquidations">-</div>
+        </div>
+        <div class="metric-card">
+            <h4>📈 BTC RSI</h4>
+            <div id="btc-rsi">-</div>
+        </div>
+    </div>
+</body>
+</html>
+""".encode('utf-8')
 
 class EnhancedCryptoAgent:
     def __init__(self, coingecko_api_key: Optional[str] = None, 
@@ -40,12 +123,13 @@ class EnhancedCryptoAgent:
             'taapi': 15       # Sehr konservativ (Free: 5000/Tag = ~3.5/Min)
         }
         
-        # Tracking für Rate Limiting
-        self.last_requests = {
-            'coingecko': [],
-            'coinglass': [],
-            'taapi': []
+        # Token Buckets für Rate Limiting (Kapazität = Limit pro Minute)
+        now = time.monotonic()
+        self.buckets = {
+            api_name: {'tokens': float(limit), 'last': now}
+            for api_name, limit in self.rate_limits.items()
         }
+        self._bucket_lock = threading.Lock()  # Abrufe laufen parallel
         
         # Top 10 Coins (reduziert für weniger API-Calls)
         self.target_coins = [
@@ -53,11 +137,35 @@ class EnhancedCryptoAgent:
             'xrp', 'usd-coin', 'cardano', 'dogecoin', 'avalanche-2'
         ]
         
+        # Coin-Liste ist fest - Query-Parameter einmal bauen
+        self._basic_params = {
+            'ids': ','.join(self.target_coins),
+            'vs_currencies': 'usd,eur',
+            'include_market_cap': 'true',
+            'include_24hr_vol': 'true',
+            'include_24hr_change': 'true',
+            'include_last_updated_at': 'true'
+        }
+        self._basic_url = f"{self.coingecko_url}/simple/price"
+        
+        # TTL-Cache für langsam veränderliche Daten (Sekunden)
+        self.cache_ttls = {
+            'global': 300,      # Globale Marktdaten
+            'fear_greed': 1800, # Fear & Greed ändert sich stündlich/täglich
+            'rsi': 1800         # RSI auf 1h-Kerzen
+        }
+        self._ttl_cache = {}  # key -> (gültig bis, Wert)
+        
         # Daten-Speicher
         self.enhanced_data = {}
+        self._last_payload_hash = None  # Inhalt der zuletzt geschriebenen Datei
+        self.archive_interval = 1800  # 30 Minuten
+        self._next_archive = time.monotonic() + self.archive_interval
         self.last_update = None
+        self._api_body = None  # (bytes, ETag) für /api/enhanced, von den Schreibern komplett ersetzt
         self.update_interval = 120  # 2 Minuten (konservativ)
         self.is_running = False
+        self._stop_event = threading.Event()  # weckt den Scheduler beim Stoppen sofort
         
         # Ausgabeordner
         self.output_dir = Path("enhanced_crypto_data")
@@ -96,31 +204,47 @@ class EnhancedCryptoAgent:
             'accept': 'application/json',
             'User-Agent': 'EnhancedCryptoAgent/1.0'
         })
-    
-    def check_rate_limit(self, api_name: str) -> bool:
-        """Prüft Rate Limit für API"""
-        now = time.time()
-        minute_ago = now - 60
-        
-        # Entferne alte Requests
-        self.last_requests[api_name] = [
-            req_time for req_time in self.last_requests[api_name] 
-            if req_time > minute_ago
-        ]
         
-        # Prüfe Limit
-        current_requests = len(self.last_requests[api_name])
-        limit = self.rate_limits[api_name]
-        
-        if current_requests >= limit:
-            print(f"⚠️ Rate Limit für {api_name} erreicht ({current_requests}/{limit})")
-            return False
+        # Fear & Greed Session (Keep-Alive statt neuer TLS-Verbindung je Abruf)
+        self.fng_session = requests.Session()
+        self.fng_session.headers.update({
+            'accept': 'application/json',
+            'User-Agent': 'EnhancedCryptoAgent/1.0'
+        })
         
-        return True
+        # Connection-Pool und Retry mit Backoff bei 429/5xx für alle Sessions
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET']
+        )
+        for session in (self.cg_session, self.glass_session, self.taapi_session, self.fng_session):
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+    
+    def refill_bucket(self, api_name: str) -> Dict:
+        """Füllt den Token Bucket entsprechend der vergangenen Zeit auf"""
+        bucket = self.buckets[api_name]
+        limit = self.rate_limits[api_name]
+        now = time.monotonic()
+        bucket['tokens'] = min(limit, bucket['tokens'] + (now - bucket['last']) * limit / 60)
+        bucket['last'] = now
+        return bucket
     
-    def record_request(self, api_name: str):
-        """Zeichnet API-Request auf"""
-        self.last_requests[api_name].append(time.time())
+    def check_rate_limit(self, api_name: str) -> bool:
+        """Prüft Rate Limit für API und verbraucht bei Erfolg einen Token"""
+        with self._bucket_lock:
+            bucket = self.refill_bucket(api_name)
+            available = bucket['tokens'] >= 1
+            if available:
+                bucket['tokens'] -= 1
+        
+        if not available:
+            limit = self.rate_limits[api_name]
+            print(f"⚠️ Rate Limit für {api_name} erreicht ({limit - int(bucket['tokens'])}/{limit})")
+        return available
     
     def safe_api_call(self, api_name: str, session: requests.Session, 
                      url: str, params: Dict = None) -> Optional[Dict]:
@@ -133,28 +257,29 @@ class EnhancedCryptoAgent:
             response = session.get(url, params=params or {})
             response.raise_for_status()
             
-            self.record_request(api_name)
-            return response.json()
+            # Direkt aus den Bytes parsen, ohne Umweg über response.text
+            return load_json(response.content)
             
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             print(f"❌ {api_name} API Fehler: {e}")
             return None
     
+    def cached_fetch(self, key, ttl: int, fetch) -> Optional[Dict]:
+        """Liefert gecachten Wert innerhalb der TTL, sonst neu abrufen"""
+        entry = self._ttl_cache.get(key)
+        now = time.monotonic()
+        if entry and entry[0] > now:
+            return entry[1]
+        
+        value = fetch()
+        # Fehlschläge nicht cachen - nächster Zyklus versucht es erneut
+        if value:
+            self._ttl_cache[key] = (now + ttl, value)
+        return value
+    
     def get_basic_market_data(self) -> Optional[Dict]:
         """Holt Basis-Marktdaten von CoinGecko"""
-        coin_ids = ','.join(self.target_coins)
-        
-        params = {
-            'ids': coin_ids,
-            'vs_currencies': 'usd,eur',
-            'include_market_cap': 'true',
-            'include_24hr_vol': 'true',
-            'include_24hr_change': 'true',
-            'include_last_updated_at': 'true'
-        }
-        
-        url = f"{self.coingecko_url}/simple/price"
-        data = self.safe_api_call('coingecko', self.cg_session, url, params)
+        data = self.safe_api_call('coingecko', self.cg_session, self._basic_url, self._basic_params)
         
         if data:
             print(f"✅ Basis-Marktdaten für {len(data)} Coins abgerufen")
@@ -163,6 +288,10 @@ class EnhancedCryptoAgent:
     
     def get_global_market_data(self) -> Optional[Dict]:
         """Holt globale Marktdaten (Total Market Cap, etc.)"""
+        return self.cached_fetch('global', self.cache_ttls['global'], self.fetch_global_market_data)
+    
+    def fetch_global_market_data(self) -> Optional[Dict]:
+        """Globale Marktdaten direkt von CoinGecko"""
         url = f"{self.coingecko_url}/global"
         data = self.safe_api_call('coingecko', self.cg_session, url)
         
@@ -173,24 +302,26 @@ class EnhancedCryptoAgent:
     
     def get_liquidation_data(self) -> Optional[Dict]:
         """Holt Liquidationsdaten von CoinGlass (nur für BTC/ETH)"""
-        if not self.check_rate_limit('coinglass'):
-            return None
-        
         # Nur für BTC und ETH um API-Calls zu sparen
         liquidation_data = {}
-        
-        for symbol in ['BTC', 'ETH']:
-            url = f"{self.coinglass_url}/api/futures/liquidation/coin/history"
-            params = {
-                'symbol': symbol,
-                'timeType': '1h',  # Letzte Stunde
-                'limit': 1
+        url = f"{self.coinglass_url}/api/futures/liquidation/coin/history"
+        
+        # Beide Symbole parallel über die gemeinsame Session;
+        # Abstand zwischen Requests regelt der coinglass Token Bucket
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {
+                symbol: executor.submit(self.safe_api_call, 'coinglass', self.glass_session, url, {
+                    'symbol': symbol,
+                    'timeType': '1h',  # Letzte Stunde
+                    'limit': 1
+                })
+                for symbol in ('BTC', 'ETH')
             }
-            
-            data = self.safe_api_call('coinglass', self.glass_session, url, params)
+        
+        for symbol, future in futures.items():
+            data = future.result()
             if data and 'data' in data:
                 liquidation_data[symbol] = data['data']
-                time.sleep(1)  # Pause zwischen Requests
         
         if liquidation_data:
             print(f"✅ Liquidationsdaten für {len(liquidation_data)} Coins abgerufen")
@@ -199,27 +330,36 @@ class EnhancedCryptoAgent:
     
     def get_fear_greed_index(self) -> Optional[Dict]:
         """Holt Fear & Greed Index"""
+        return self.cached_fetch('fear_greed', self.cache_ttls['fear_greed'], self.fetch_fear_greed_index)
+    
+    def fetch_fear_greed_index(self) -> Optional[Dict]:
+        """Fear & Greed Index direkt von alternative.me"""
         url = "https://api.alternative.me/fng/"
         
         try:
-            response = requests.get(url, timeout=10)
+            response = self.fng_session.get(url, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = load_json(response.content)
             
             if data and 'data' in data:
                 print("✅ Fear & Greed Index abgerufen")
                 return data['data'][0]
                 
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             print(f"❌ Fear & Greed Index Fehler: {e}")
         
         return None
     
     def get_rsi_data(self, symbol: str = 'BTC/USDT') -> Optional[Dict]:
         """Holt RSI-Daten von TAAPI (nur für BTC)"""
-        if not self.taapi_key or not self.check_rate_limit('taapi'):
+        if not self.taapi_key:
             return None
         
+        return self.cached_fetch(('rsi', symbol), self.cache_ttls['rsi'],
+                                 lambda: self.fetch_rsi_data(symbol))
+    
+    def fetch_rsi_data(self, symbol: str) -> Optional[Dict]:
+        """RSI-Daten direkt von TAAPI"""
         params = {
             'secret': self.taapi_key,
             'exchange': 'binance',
@@ -257,54 +397,60 @@ class EnhancedCryptoAgent:
                 'markets': global_info.get('markets')
             }
         
-        total_change = 0
-        valid_changes = 0
-        
-        for coin_id, data in basic_data.items():
-            if data.get('usd_market_cap'):
-                metrics['total_market_cap_usd'] += data['usd_market_cap']
-            if data.get('usd_24h_vol'):
-                metrics['total_volume_24h_usd'] += data['usd_24h_vol']
-            
-            change = data.get('usd_24h_change')
-            if change is not None:
-                total_change += change
-                valid_changes += 1
-                
-                if change > 0:
-                    metrics['coins_above_zero'] += 1
-                else:
-                    metrics['coins_below_zero'] += 1
-        
-        if valid_changes > 0:
-            metrics['average_24h_change'] = total_change / valid_changes
+        # Spaltenweise als Arrays - Summen und Zählungen ohne Python-Schleife
+        count = len(basic_data)
+        coins = basic_data.values()
+        market_caps = np.fromiter((data.get('usd_market_cap') or 0 for data in coins), dtype=np.float64, count=count)
+        volumes = np.fromiter((data.get('usd_24h_vol') or 0 for data in coins), dtype=np.float64, count=count)
+        changes = np.fromiter(
+            (np.nan if data.get('usd_24h_change') is None else data['usd_24h_change'] for data in coins),
+            dtype=np.float64, count=count
+        )
+        valid_changes = changes[~np.isnan(changes)]
+        
+        metrics['total_market_cap_usd'] = float(market_caps.sum())
+        metrics['total_volume_24h_usd'] = float(volumes.sum())
+        metrics['coins_above_zero'] = int((valid_changes > 0).sum())
+        metrics['coins_below_zero'] = int((valid_changes <= 0).sum())
+        if valid_changes.size > 0:
+            metrics['average_24h_change'] = float(valid_changes.mean())
         
         return metrics
     
     def update_enhanced_data(self):
         """Aktualisiert alle erweiterten Daten"""
-        print(f"🔄 Aktualisiere erweiterte Daten um {datetime.now().strftime('%H:%M:%S')}")
+        # Ein Zeitstempel pro Zyklus für Log, Daten und Dateinamen
+        update_time = datetime.now()
+        print(f"🔄 Aktualisiere erweiterte Daten um {update_time.strftime('%H:%M:%S')}")
+        
+        # Alle Quellen sind unabhängig - parallel statt nacheinander abrufen
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            basic_future = executor.submit(self.get_basic_market_data)
+            global_future = executor.submit(self.get_global_market_data)
+            liquidation_future = executor.submit(self.get_liquidation_data)
+            fear_greed_future = executor.submit(self.get_fear_greed_index)
+            rsi_future = executor.submit(self.get_rsi_data) if self.taapi_key else None
         
         # Basis-Daten (immer)
-        basic_data = self.get_basic_market_data()
+        basic_data = basic_future.result()
         if not basic_data:
             print("❌ Basis-Daten konnten nicht abgerufen werden")
             return
         
         # Globale Daten (immer)
-        global_data = self.get_global_market_data()
+        global_data = global_future.result()
         
         # Erweiterte Daten (nur wenn APIs verfügbar)
-        liquidation_data = self.get_liquidation_data()
-        fear_greed = self.get_fear_greed_index()
-        rsi_data = self.get_rsi_data() if self.taapi_key else None
+        liquidation_data = liquidation_future.result()
+        fear_greed = fear_greed_future.result()
+        rsi_data = rsi_future.result() if rsi_future else None
         
         # Berechne Metriken
         market_metrics = self.calculate_market_metrics(basic_data, global_data)
         
         # Kombiniere alle Daten
         self.enhanced_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': update_time.isoformat(),
             'update_interval_seconds': self.update_interval,
             'api_status': {
                 'coingecko': 'active',
@@ -322,8 +468,10 @@ class EnhancedCryptoAgent:
             'rate_limit_status': self.get_rate_limit_status()
         }
         
-        self.last_update = datetime.now()
-        self.save_enhanced_data()
+        self.last_update = update_time
+        # Fertig gebaut und in einem Schritt ersetzt - Leser sehen nie einen halben Stand
+        self._api_body = self._build_api_body()
+        self.save_enhanced_data(update_time)
         
         print(f"✅ Erweiterte Daten aktualisiert: {len(self.enhanced_data['coins'])} Coins")
     
@@ -349,8 +497,9 @@ class EnhancedCryptoAgent:
         status = {}
         
         for api_name in self.rate_limits:
-            current_requests = len(self.last_requests[api_name])
             limit = self.rate_limits[api_name]
+            with self._bucket_lock:
+                current_requests = limit - int(self.refill_bucket(api_name)['tokens'])
             
             status[api_name] = {
                 'current_requests_per_minute': current_requests,
@@ -361,23 +510,53 @@ class EnhancedCryptoAgent:
         
         return status
     
-    def save_enhanced_data(self):
+    def _build_api_body(self):
+        """Kodiert die /api/enhanced Antwort als (bytes, ETag)"""
+        body = dump_json({
+            "data": self.enhanced_data,
+            "last_update": self.last_update.isoformat() if self.last_update else None,
+            "status": "active" if self.is_running else "stopped"
+        })
+        return body, hashlib.blake2b(body, digest_size=8).hexdigest()
+    
+    def get_api_body(self):
+        """Serialisierte /api/enhanced Antwort - nur nach Updates neu kodiert"""
+        # Vor dem ersten Update ungecacht bauen, damit kein Leser einen veralteten Stand ablegt
+        return self._api_body or self._build_api_body()
+    
+    def save_enhanced_data(self, saved_at: Optional[datetime] = None):
         """Speichert erweiterte Daten"""
         if not self.enhanced_data:
             return
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # Nur schreiben wenn sich mehr als Zeitstempel/Rate-Limits geändert hat
+        payload = {k: v for k, v in self.enhanced_data.items() if k not in ('timestamp', 'rate_limit_status')}
+        payload_hash = hashlib.blake2b(dump_json(payload, sort_keys=True), digest_size=16).digest()
+        if payload_hash == self._last_payload_hash:
+            print("📄 Daten unverändert - Datei nicht neu geschrieben")
+            return
+        
+        timestamp = (saved_at or datetime.now()).strftime('%Y%m%d_%H%M%S')
         current_file = self.output_dir / "current_enhanced_data.json"
         
         try:
-            with open(current_file, 'w', encoding='utf-8') as f:
-                json.dump(self.enhanced_data, f, indent=2, ensure_ascii=False)
+            # Einmal serialisieren; atomar ersetzen, damit Leser nie eine halbe Datei sehen
+            data_bytes = dump_json_pretty(self.enhanced_data)
+            tmp_file = current_file.with_suffix('.json.tmp')
+            tmp_file.write_bytes(data_bytes)
+            os.replace(tmp_file, current_file)
+            self._last_payload_hash = payload_hash
             
             # Archiviere alle 30 Minuten
-            if datetime.now().minute % 30 == 0:
+            now = time.monotonic()
+            if now >= self._next_archive:
+                self._next_archive = now + self.archive_interval
                 archive_file = self.output_dir / f"enhanced_data_{timestamp}.json"
-                with open(archive_file, 'w', encoding='utf-8') as f:
-                    json.dump(self.enhanced_data, f, indent=2, ensure_ascii=False)
+                # Hardlink auf die gerade geschriebene Datei statt zweitem Schreibvorgang
+                try:
+                    os.link(current_file, archive_file)
+                except OSError:
+                    archive_file.write_bytes(data_bytes)
                 print(f"📁 Daten archiviert: {archive_file}")
                 
         except Exception as e:
@@ -390,6 +569,8 @@ class EnhancedCryptoAgent:
             return
         
         self.is_running = True
+        self._api_body = self._build_api_body()
+        self._stop_event.clear()
         print(f"🚀 Enhanced Monitoring gestartet (Update alle {self.update_interval}s)")
         print(f"📊 Überwachte Coins: {len(self.target_coins)}")
         print(f"🔑 APIs: CoinGecko{'✓' if self.coingecko_key else '(free)'}, "
@@ -399,102 +580,45 @@ class EnhancedCryptoAgent:
         # Erste Aktualisierung
         self.update_enhanced_data()
         
-        # Schedule für Updates
-        schedule.every(self.update_interval).seconds.do(self.update_enhanced_data)
-        
         def run_scheduler():
-            while self.is_running:
-                schedule.run_pending()
-                time.sleep(1)
+            # Ein Job - schlafen bis zur nächsten Deadline statt jede Sekunde zu prüfen
+            next_run = time.monotonic() + self.update_interval
+            while not self._stop_event.wait(timeout=max(0, next_run - time.monotonic())):
+                self.update_enhanced_data()
+                # Nach einem überlangen Update nicht mehrere Läufe nachholen
+                next_run = max(next_run + self.update_interval, time.monotonic())
         
         scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
         scheduler_thread.start()
         
         print("✅ Enhanced Monitoring aktiv")
     
+    def stop_enhanced_monitoring(self):
+        """Stoppt erweitertes Monitoring"""
+        self.is_running = False
+        self._api_body = self._build_api_body()
+        self._stop_event.set()
+    
+    def run_dashboard(self, host: str = '0.0.0.0', port: int = 5001):
+        """Startet das Dashboard - waitress mit Thread-Pool falls installiert"""
+        if serve is not None:
+            serve(self.app, host=host, port=port, threads=8)
+        else:
+            self.app.run(host=host, port=port, debug=False, threaded=True)
+    
     def setup_routes(self):
         """Flask-Routen für Web-Interface"""
         
         @self.app.route('/')
         def enhanced_dashboard():
-            return """
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Enhanced Crypto Dashboard</title>
-                <meta charset="utf-8">
-                <style>
-                    body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
-                    .header { background: #2c3e50; color: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; }
-                    .metrics-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 15px; margin-bottom: 20px; }
-                    .metric-card { background: white; padding: 15px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-                    .rate-limits { background: #ecf0f1; padding: 15px; border-radius: 8px; margin-bottom: 20px; }
-                    .api-status { display: flex; gap: 10px; margin: 10px 0; }
-                    .status-badge { padding: 4px 8px; border-radius: 4px; color: white; font-size: 12px; }
-                    .active { background: #27ae60; }
-                    .limited { background: #f39c12; }
-                    .inactive { background: #e74c3c; }
-                </style>
-                <script>
-                    function refreshData() {
-                        fetch('/api/enhanced')
-                            .then(response => response.json())
-                            .then(data => updateDashboard(data))
-                            .catch(error => console.error('Error:', error));
-                    }
-                    
-                    function updateDashboard(data) {
-                        if (data.data) {
-                            document.getElementById('last-update').textContent = 
-                                'Letztes Update: ' + new Date(data.last_update).toLocaleString();
-                        }
-                    }
-                    
-                    setInterval(refreshData, 60000);
-                    window.onload = refreshData;
-                </script>
-            </head>
-            <body>
-                <div class="header">
-                    <h1>📊 Enhanced Crypto Dashboard</h1>
-                    <p>Erweiterte Kryptowährungsdaten mit konservativen Rate Limits</p>
-                    <div id="last-update">Lade Daten...</div>
-                </div>
-                
-                <div class="rate-limits">
-                    <h3>🚦 API Rate Limit Status</h3>
-                    <div id="rate-status">Lade Status...</div>
-                </div>
-                
-                <div class="metrics-grid">
-                    <div class="metric-card">
-                        <h4>💰 Marktkapitalisierung</h4>
-                        <div id="market-cap">-</div>
-                    </div>
-                    <div class="metric-card">
-                        <h4>😨 Fear & Greed Index</h4>
-                        <div id="fear-greed">-</div>
-                    </div>
-                    <div class="metric-card">
-                        <h4>💧 Liquidationen (24h)</h4>
-                        <div id="liquidations">-</div>
-                    </div>
-                    <div class="metric-card">
-                        <h4>📈 BTC RSI</h4>
-                        <div id="btc-rsi">-</div>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
+            return Response(_DASHBOARD_HTML, mimetype='text/html')
         
         @self.app.route('/api/enhanced')
         def api_enhanced_data():
-            return jsonify({
-                "data": self.enhanced_data,
-                "last_update": self.last_update.isoformat() if self.last_update else None,
-                "status": "active" if self.is_running else "stopped"
-            })
+            body, etag = self.get_api_body()
+            response = Response(body, mimetype='application/json')
+            response.set_etag(etag)
+            return response.make_conditional(request)
 
 def main():
     """Hauptfunktion"""
@@ -546,7 +670,7 @@ def main():
             while True:
                 time.sleep(1)
         except KeyboardInterrupt:
-            agent.is_running = False
+            agent.stop_enhanced_monitoring()
             
     elif choice == "2":
         agent.update_enhanced_data()
@@ -565,14 +689,14 @@ def main():
                 
     elif choice == "3":
         agent.update_enhanced_data()
-        agent.app.run(host='0.0.0.0', port=5001, debug=False)
+        agent.run_dashboard()
         
     elif choice == "4":
         agent.start_enhanced_monitoring()
         time.sleep(3)
         
         import threading
-        web_thread = threading.Thread(target=lambda: agent.app.run(host='0.0.0.0', port=5001, debug=False), daemon=True)
+        web_thread = threading.Thread(target=agent.run_dashboard, daemon=True)
         web_thread.start()
         
         print("✅ Enhanced Monitoring und Dashboard aktiv")
@@ -583,7 +707,7 @@ def main():
             while True:
                 time.sleep(1)
         except KeyboardInterrupt:
-            agent.is_running = False
+            agent.stop_enhanced_monitoring()
     
     else:
         print("❌ Ungültige Auswahl")
@@ -4,89 +4,484 @@ AgentCeli Monitoring Dashboard
 Umfassendes Dashboard für alle Systemaktivitäten mit funktionaler Backend-Verbindung
 """
 
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, jsonify, render_template, request
 import json
+import hashlib
 import sqlite3
 import os
+import queue
+import subprocess
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
 import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import glob
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from agentceli_utils import OrjsonProvider
+
+# flask-compress ist optional - ohne Paket gehen Antworten unkomprimiert raus
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+# psutil ist optional - ohne Paket wird `ps aux` ausgewertet
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+# OrjsonProvider ist None ohne orjson - dann bleibt Flasks Standard-Encoder aktiv
+if OrjsonProvider is not None:
+    app.json = OrjsonProvider(app)
+if Compress is not None:
+    # Level 4: deutlich kleinere JSON/HTML-Antworten bei wenig CPU
+    app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html', 'text/css', 'application/javascript']
+    app.config['COMPRESS_LEVEL'] = 4
+    Compress(app)
+
+# Dashboard-Refresh im Browser, per Umgebungsvariable einstellbar
+POLL_INTERVAL_MS = int(os.environ.get('POLL_INTERVAL_MS', 30000))
+
+# Push-Intervall für /api/stream in Sekunden
+STREAM_INTERVAL = int(os.environ.get('STREAM_INTERVAL', 5))
+
+# Pro Client-IP höchstens 10 API-Requests/s (Burst 20)
+RATE_LIMIT_PER_SECOND = 10
+RATE_LIMIT_BURST = 20
+
+# Aggregierter Dashboard-Endpunkt des AgentCeli-Collectors
+AGGREGATE_URL = 'http://localhost:8080/api/aggregate/dashboard'
+
+# Upstream-Probes (Fallback wenn der Collector nicht läuft)
+BINANCE_PROBE_URL = 'https://api.binance.com/api/v3/ticker/24hr?symbol=BTCUSDT'
+COINGECKO_PROBE_URL = 'https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum&vs_currencies=usd&include_24hr_change=true'
+FEAR_GREED_PROBE_URL = 'https://api.alternative.me/fng/'
+
+# Cache-TTLs je Endpoint in Sekunden (kurz / normal / lang)
+CACHE_TTLS = {
+    'system': 5,
+    'logs': 5,
+    'crypto': 5,
+    'apis': 15,
+    'data': 30
+}
+
+# Nach einem Fehlschlag wird der veraltete Wert so lange weiter ausgeliefert
+STALE_RETRY_SECONDS = 5
+
+class ResponseCache:
+    """In-Process TTL-Cache für Dashboard-Antworten"""
+    
+    def __init__(self):
+        self._entries = {}  # key -> (expires_at, value)
+        self._inflight = {}  # key -> Future der laufenden Berechnung
+        self._lock = threading.Lock()
+    
+    def get_or_compute(self, key, ttl, compute):
+        """Liefert (Wert, Cache-Status) - HIT, MISS, STALE oder SHARED"""
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1], 'HIT'
+        
+        # Single-Flight: bei Ablauf rechnet nur ein Request, alle anderen warten darauf
+        with self._lock:
+            # Erneut prüfen - ein anderer Leader kann inzwischen fertig geworden sein
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1], 'HIT'
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result(), 'SHARED'
+        
+        try:
+            value = compute()
+        except Exception as e:
+            # Upstream-Fehler: lieber veraltete Daten als gar keine
+            if entry:
+                # Kurz erneut gültig machen, damit nicht jeder Request den Ausfall neu abfragt
+                self._entries[key] = (time.monotonic() + min(ttl, STALE_RETRY_SECONDS), entry[1])
+                future.set_result(entry[1])
+                return entry[1], 'STALE'
+            future.set_exception(e)
+            raise
+        else:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            future.set_result(value)
+            return value, 'MISS'
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+response_cache = ResponseCache()
+
+def read_tail_lines(path, count, chunk_size=8192):
+    """Liest die letzten `count` Zeilen vom Dateiende her"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        buffer = b''
+        # Eine Zeile mehr suchen, damit die erste Zeile vollständig ist
+        while position > 0 and buffer.count(b'\n') <= count:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            buffer = f.read(read_size) + buffer
+    lines = buffer.decode('utf-8', errors='ignore').splitlines()
+    return lines[-count:]
+
+def count_newlines(path, start=0, chunk_size=65536):
+    """Zählt Zeilenumbrüche blockweise ab Byte-Offset `start` - liefert (Anzahl, End-Offset, letztes Byte)"""
+    total = 0
+    last = b''
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while chunk := f.read(chunk_size):
+            total += chunk.count(b'\n')
+            last = chunk[-1:]
+        end = f.tell()
+    return total, end, last
+
+def encode_payload(payload):
+    """Kodiert ein Panel einmal beim Cachen - liefert (Payload, JSON-bytes, ETag)"""
+    body = app.json.dumps(payload).encode('utf-8')
+    # ETag nur über den Inhalt - der Erzeugungszeitstempel allein ist keine Änderung
+    content = {k: v for k, v in payload.items() if k != 'timestamp'} if isinstance(payload, dict) else payload
+    etag = hashlib.blake2b(app.json.dumps(content).encode('utf-8'), digest_size=16).hexdigest()
+    return payload, body, etag
+
+def join_panels(entries):
+    """Setzt fertig kodierte Panels zu einem JSON-Objekt zusammen, ohne neu zu kodieren"""
+    return b'{' + b','.join(
+        f'"{key}":'.encode('utf-8') + (entry[1] if entry else b'null')
+        for key, entry in entries.items()
+    ) + b'}'
+
+def json_response(body, etag, max_age):
+    """JSON-Antwort aus fertigen bytes - bei passendem If-None-Match ein leeres 304"""
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    # Browser dürfen die Antwort so lange wiederverwenden wie der Server-Cache
+    response.headers['Cache-Control'] = f"max-age={max_age}"
+    return response
+
+def cached_response(key):
+    """JSON-Antwort aus dem TTL-Cache mit X-Cache Header"""
+    (_, body, etag), cache_status = get_panel(key)
+    response = json_response(body, etag, CACHE_TTLS[key])
+    response.headers['X-Cache'] = cache_status
+    return response
+
+class ClientRateLimiter:
+    """Token-Bucket je Client-IP"""
+    
+    def __init__(self, rate, burst, idle_horizon=300):
+        self.rate = rate
+        self.burst = burst
+        self.idle_horizon = idle_horizon  # so lange ungenutzte, volle Buckets werden entfernt
+        self._buckets = {}  # ip -> (tokens, last_refill)
+        self._next_sweep = time.monotonic() + idle_horizon
+        self._lock = threading.Lock()
+    
+    def _sweep(self, now):
+        # Ein voll aufgefüllter Bucket verhält sich wie ein neuer - Eintrag kann weg
+        self._buckets = {
+            client_id: (tokens, last_refill)
+            for client_id, (tokens, last_refill) in self._buckets.items()
+            if now - last_refill < self.idle_horizon or tokens + (now - last_refill) * self.rate < self.burst
+        }
+        self._next_sweep = now + self.idle_horizon
+    
+    def acquire(self, client_id):
+        """Gibt 0 zurück wenn erlaubt, sonst die Wartezeit in Sekunden"""
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._next_sweep:
+                self._sweep(now)
+            tokens, last_refill = self._buckets.get(client_id, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last_refill) * self.rate)
+            if tokens >= 1:
+                self._buckets[client_id] = (tokens - 1, now)
+                return 0
+            self._buckets[client_id] = (tokens, now)
+            return (1 - tokens) / self.rate
+
+rate_limiter = ClientRateLimiter(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
 
 class AgentCeliMonitor:
     def __init__(self):
         self.base_dir = Path(__file__).parent
+        self.setup_paths()
         self.setup_logging()
         self.refresh_interval = 30  # seconds
         self.cached_data = {}
         self.last_update = {}
+        self.log_cache = {}  # Pfad -> ((mtime, size), (inode, offset, newlines, last byte), recent)
+        self.crypto_cache = (0.0, None, {})  # (geprüft um, Datei-Signatur, Daten)
+        self.probe_timeout = 5  # seconds
+        self.probe_executor = ThreadPoolExecutor(max_workers=3)
+        self.setup_session()
         
+    def setup_paths(self):
+        """Dateipfade einmal auflösen statt bei jedem Request"""
+        self.base_dir_str = str(self.base_dir)
+        self.config_file = self.base_dir / 'agentceli_config.json'
+        self.liquidation_file = self.base_dir / 'liquidation_data/liquidation_analysis_latest.json'
+        self.crypto_files = (
+            self.base_dir / 'correlation_data/hybrid_latest.json',
+            self.liquidation_file  # Fallback
+        )
+        self.json_globs = [
+            str(self.base_dir / pattern)
+            for pattern in ('correlation_data/*.json', 'liquidation_data/*.json', '*.json')
+        ]
+        self.db_files = [
+            (db_file, self.base_dir / db_file)
+            for db_file in ('correlation_data/hybrid_crypto_data.db', 'monitoring.db', 'contact_agent.db')
+        ]
+        self.log_dir = self.base_dir / 'logs'
+    
     def setup_logging(self):
         logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
+    
+    def setup_session(self):
+        """Gemeinsame HTTP-Session mit Connection-Pool für alle Probes"""
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=16,
+            max_retries=Retry(total=1, backoff_factor=0.1)
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Connection': 'keep-alive'})
     
     def get_system_status(self):
         """Systemstatus und laufende Prozesse"""
+        if psutil is None:
+            return self.get_system_status_ps()
+        
+        processes = []
+        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+            try:
+                cmdline = ' '.join(proc.info['cmdline'] or [])
+                if 'agentceli' in cmdline.lower() or 'python' in cmdline and any(
+                    agent_file in cmdline for agent_file in [
+                        'agentceli_hybrid.py', 'liquidation_analyzer.py', 
+                        'whale_alert', 'santiment'
+                    ]
+                ):
+                    processes.append({
+                        'pid': proc.info['pid'],
+                        'name': proc.info['name'],
+                        'command': cmdline[:80] + '...' if len(cmdline) > 80 else cmdline,
+                        'status': 'running'
+                    })
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return processes
+    
+    def get_system_status_ps(self):
+        """Fallback ohne psutil"""
         try:
-            import psutil
+            result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
+            lines = result.stdout.split('\n')
             processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    cmdline = ' '.join(proc.info['cmdline'] or [])
-                    if 'agentceli' in cmdline.lower() or 'python' in cmdline and any(
-                        agent_file in cmdline for agent_file in [
-                            'agentceli_hybrid.py', 'liquidation_analyzer.py', 
-                            'whale_alert', 'santiment'
-                        ]
-                    ):
+            for line in lines:
+                if 'agentceli' in line.lower() or ('python' in line and any(
+                    agent in line for agent in ['hybrid', 'liquidation', 'whale', 'santiment']
+                )):
+                    parts = line.split()
+                    if len(parts) > 10:
                         processes.append({
-                            'pid': proc.info['pid'],
-                            'name': proc.info['name'],
-                            'command': cmdline[:80] + '...' if len(cmdline) > 80 else cmdline,
+                            'pid': parts[1],
+                            'name': parts[10],
+                            'command': ' '.join(parts[10:])[:80],
                             'status': 'running'
                         })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
             return processes
-        except ImportError:
-            # Fallback ohne psutil
-            import subprocess
+        except Exception as e:
+            self.logger.error(f"Process check failed: {e}")
+            return []
+    
+    def offline_source(self, name, data_type, error='Verbindungsfehler'):
+        """Eintrag für eine nicht erreichbare API-Quelle"""
+        return {
+            'name': name,
+            'status': 'inaktiv',
+            'active': False,
+            'value': 'Keine Daten',
+            'data_type': data_type,
+            'last_update': 'Nie',
+            'next_request': 'Gestoppt',
+            'interval': 'N/A',
+            'error': error
+        }
+    
+    def source_entry(self, name, enabled, value, change, data_type, interval, response_time, last_update=None):
+        """Eintrag für eine aktive API-Quelle"""
+        last_update = last_update or datetime.now()
+        return {
+            'name': name,
+            'status': 'aktiv' if enabled else 'konfiguriert',
+            'active': enabled,
+            'value': value,
+            'change': change,
+            'data_type': data_type,
+            'last_update': last_update.strftime('%d.%m.%Y %H:%M Uhr'),
+            'next_request': (datetime.now() + timedelta(seconds=interval)).strftime('%H:%M Uhr'),
+            'interval': f"{interval//60} Min",
+            'response_time': response_time
+        }
+    
+    def probe_binance(self, enabled, intervals):
+        """Binance API prüfen"""
+        start_time = time.time()
+        response = self.session.get(BINANCE_PROBE_URL, timeout=self.probe_timeout)
+        response_time = round((time.time() - start_time) * 1000, 2)
+        
+        if response.status_code != 200:
+            return {}
+        
+        data = response.json()
+        price = float(data['lastPrice'])
+        change = float(data['priceChangePercent'])
+        
+        return self.source_entry('Binance', enabled, f"${price:,.0f} BTC", f"{change:+.2f}%",
+                                 'Preise & Volumen', intervals['fast_data'], f"{response_time}ms")
+    
+    def probe_coingecko(self, enabled, intervals):
+        """CoinGecko API prüfen"""
+        start_time = time.time()
+        response = self.session.get(COINGECKO_PROBE_URL, timeout=self.probe_timeout)
+        response_time = round((time.time() - start_time) * 1000, 2)
+        
+        if response.status_code != 200:
+            return {}
+        
+        data = response.json()
+        btc_price = data.get('bitcoin', {}).get('usd', 0)
+        btc_change = data.get('bitcoin', {}).get('usd_24h_change', 0)
+        
+        return self.source_entry('CoinGecko', enabled, f"${btc_price:,.0f} BTC", f"{btc_change:+.2f}%",
+                                 'Market Data', intervals['fast_data'], f"{response_time}ms")
+    
+    def probe_fear_greed(self, enabled, intervals):
+        """Fear & Greed Index prüfen"""
+        start_time = time.time()
+        response = self.session.get(FEAR_GREED_PROBE_URL, timeout=self.probe_timeout)
+        response_time = round((time.time() - start_time) * 1000, 2)
+        
+        if response.status_code != 200:
+            return {}
+        
+        data = response.json()
+        if not (data.get('data') and len(data['data']) > 0):
+            return {}
+        
+        fng_value = data['data'][0]['value']
+        fng_class = data['data'][0]['value_classification']
+        
+        return self.source_entry('Fear & Greed Index', enabled, f"{fng_value}/100", fng_class,
+                                 'Markt-Sentiment', intervals['very_slow'], f"{response_time}ms")
+    
+    def get_aggregate_sources(self, free_apis, intervals):
+        """Live-Quellen mit einem Request vom AgentCeli-Collector (None wenn nicht verfügbar)"""
+        try:
+            response = self.session.get(AGGREGATE_URL, timeout=2)
+            if response.status_code != 200:
+                return None
+            aggregate = response.json()
+            collected_at = datetime.fromisoformat(aggregate['timestamp'])
+        except (requests.RequestException, ValueError, KeyError):
+            return None
+        
+        api_sources = []
+        enabled = {key: free_apis.get(key, {}).get('enabled', False) for key in ('binance', 'coingecko', 'fear_greed')}
+        
+        btc = (aggregate.get('binance') or {}).get('BTCUSDT')
+        if btc:
+            api_sources.append(self.source_entry(
+                'Binance', enabled['binance'], f"${btc['price']:,.0f} BTC", f"{btc['change_24h']:+.2f}%",
+                'Preise & Volumen', intervals['fast_data'], 'Collector', collected_at))
+        else:
+            api_sources.append(self.offline_source('Binance', 'Preise & Volumen'))
+        
+        bitcoin = (aggregate.get('coingecko') or {}).get('bitcoin')
+        if bitcoin:
+            api_sources.append(self.source_entry(
+                'CoinGecko', enabled['coingecko'], f"${bitcoin.get('usd', 0):,.0f} BTC",
+                f"{bitcoin.get('usd_24h_change', 0):+.2f}%",
+                'Market Data', intervals['fast_data'], 'Collector', collected_at))
+        else:
+            api_sources.append(self.offline_source('CoinGecko', 'Market Data'))
+        
+        fear_greed = aggregate.get('fear_greed')
+        if fear_greed:
+            api_sources.append(self.source_entry(
+                'Fear & Greed Index', enabled['fear_greed'], f"{fear_greed['value']}/100",
+                fear_greed.get('value_classification'),
+                'Markt-Sentiment', intervals['very_slow'], 'Collector', collected_at))
+        else:
+            api_sources.append(self.offline_source('Fear & Greed Index', 'Markt-Sentiment'))
+        
+        return api_sources
+    
+    def probe_upstream_sources(self, free_apis, intervals):
+        """Fallback: Binance, CoinGecko und Fear & Greed direkt abfragen"""
+        api_sources = []
+        
+        # Die drei Upstream-Probes sind unabhängig - parallel statt nacheinander
+        probes = [
+            ('Binance', 'Preise & Volumen', self.probe_binance, 'binance'),
+            ('CoinGecko', 'Market Data', self.probe_coingecko, 'coingecko'),
+            ('Fear & Greed Index', 'Markt-Sentiment', self.probe_fear_greed, 'fear_greed')
+        ]
+        futures = [
+            self.probe_executor.submit(probe, free_apis.get(key, {}).get('enabled', False), intervals)
+            for _, _, probe, key in probes
+        ]
+        wait(futures, timeout=self.probe_timeout + 1)
+        
+        for (name, data_type, _, _), future in zip(probes, futures):
             try:
-                result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-                lines = result.stdout.split('\n')
-                processes = []
-                for line in lines:
-                    if 'agentceli' in line.lower() or ('python' in line and any(
-                        agent in line for agent in ['hybrid', 'liquidation', 'whale', 'santiment']
-                    )):
-                        parts = line.split()
-                        if len(parts) > 10:
-                            processes.append({
-                                'pid': parts[1],
-                                'name': parts[10],
-                                'command': ' '.join(parts[10:])[:80],
-                                'status': 'running'
-                            })
-                return processes
-            except Exception as e:
-                self.logger.error(f"Process check failed: {e}")
-                return []
+                source = future.result(timeout=0)
+            except (requests.ConnectionError, requests.Timeout, FutureTimeout) as e:
+                # Erwartete Netzwerkfehler - kein Stacktrace nötig
+                source = self.offline_source(name, data_type, type(e).__name__)
+            except Exception:
+                self.logger.exception(f"{name} probe failed")
+                source = self.offline_source(name, data_type, 'Fehler')
+            if source:
+                api_sources.append(source)
+        
+        return api_sources
     
     def get_api_sources_detail(self):
         """Detaillierte API-Quellen Status mit Daten und Timing"""
         
         # Lade Konfiguration
         try:
-            with open(self.base_dir / 'agentceli_config.json', 'r') as f:
+            with open(self.config_file, 'r') as f:
                 config = json.load(f)
-        except:
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.debug("Config not loaded: %s", e)
             config = {}
-            
+        
         # Lade aktuelle Daten
         current_data = self.get_current_crypto_data()
         
@@ -97,119 +492,12 @@ class AgentCeliMonitor:
             'very_slow': 3600    # 1 Stunde
         })
         
-        api_sources = []
+        free_apis = config.get('data_sources', {}).get('free_apis', {})
         
-        # Binance API
-        binance_enabled = config.get('data_sources', {}).get('free_apis', {}).get('binance', {}).get('enabled', False)
-        try:
-            start_time = time.time()
-            response = requests.get('https://api.binance.com/api/v3/ticker/24hr?symbol=BTCUSDT', timeout=5)
-            response_time = round((time.time() - start_time) * 1000, 2)
-            
-            if response.status_code == 200:
-                data = response.json()
-                price = float(data['lastPrice'])
-                change = float(data['priceChangePercent'])
-                
-                api_sources.append({
-                    'name': 'Binance',
-                    'status': 'aktiv' if binance_enabled else 'konfiguriert',
-                    'active': binance_enabled,
-                    'value': f"${price:,.0f} BTC",
-                    'change': f"{change:+.2f}%",
-                    'data_type': 'Preise & Volumen',
-                    'last_update': datetime.now().strftime('%d.%m.%Y %H:%M Uhr'),
-                    'next_request': (datetime.now() + timedelta(seconds=intervals['fast_data'])).strftime('%H:%M Uhr'),
-                    'interval': f"{intervals['fast_data']//60} Min",
-                    'response_time': f"{response_time}ms"
-                })
-        except:
-            api_sources.append({
-                'name': 'Binance',
-                'status': 'inaktiv',
-                'active': False,
-                'value': 'Keine Daten',
-                'data_type': 'Preise & Volumen',
-                'last_update': 'Nie',
-                'next_request': 'Gestoppt',
-                'interval': 'N/A',
-                'error': 'Verbindungsfehler'
-            })
-            
-        # CoinGecko API  
-        coingecko_enabled = config.get('data_sources', {}).get('free_apis', {}).get('coingecko', {}).get('enabled', False)
-        try:
-            start_time = time.time()
-            response = requests.get('https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum&vs_currencies=usd&include_24hr_change=true', timeout=5)
-            response_time = round((time.time() - start_time) * 1000, 2)
-            
-            if response.status_code == 200:
-                data = response.json()
-                btc_price = data.get('bitcoin', {}).get('usd', 0)
-                btc_change = data.get('bitcoin', {}).get('usd_24h_change', 0)
-                
-                api_sources.append({
-                    'name': 'CoinGecko',
-                    'status': 'aktiv' if coingecko_enabled else 'konfiguriert',
-                    'active': coingecko_enabled,
-                    'value': f"${btc_price:,.0f} BTC",
-                    'change': f"{btc_change:+.2f}%",
-                    'data_type': 'Market Data',
-                    'last_update': datetime.now().strftime('%d.%m.%Y %H:%M Uhr'),
-                    'next_request': (datetime.now() + timedelta(seconds=intervals['fast_data'])).strftime('%H:%M Uhr'),
-                    'interval': f"{intervals['fast_data']//60} Min",
-                    'response_time': f"{response_time}ms"
-                })
-        except:
-            api_sources.append({
-                'name': 'CoinGecko',
-                'status': 'inaktiv',
-                'active': False,
-                'value': 'Keine Daten',
-                'data_type': 'Market Data',
-                'last_update': 'Nie',
-                'next_request': 'Gestoppt',
-                'interval': 'N/A',
-                'error': 'Verbindungsfehler'
-            })
-            
-        # Fear & Greed Index
-        fear_greed_enabled = config.get('data_sources', {}).get('free_apis', {}).get('fear_greed', {}).get('enabled', False)
-        try:
-            start_time = time.time()
-            response = requests.get('https://api.alternative.me/fng/', timeout=5)
-            response_time = round((time.time() - start_time) * 1000, 2)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('data') and len(data['data']) > 0:
-                    fng_value = data['data'][0]['value']
-                    fng_class = data['data'][0]['value_classification']
-                    
-                    api_sources.append({
-                        'name': 'Fear & Greed Index',
-                        'status': 'aktiv' if fear_greed_enabled else 'konfiguriert',
-                        'active': fear_greed_enabled,
-                        'value': f"{fng_value}/100",
-                        'change': fng_class,
-                        'data_type': 'Markt-Sentiment',
-                        'last_update': datetime.now().strftime('%d.%m.%Y %H:%M Uhr'),
-                        'next_request': (datetime.now() + timedelta(seconds=intervals['very_slow'])).strftime('%H:%M Uhr'),
-                        'interval': f"{intervals['very_slow']//60} Min",
-                        'response_time': f"{response_time}ms"
-                    })
-        except:
-            api_sources.append({
-                'name': 'Fear & Greed Index',
-                'status': 'inaktiv',
-                'active': False,
-                'value': 'Keine Daten',
-                'data_type': 'Markt-Sentiment',
-                'last_update': 'Nie',
-                'next_request': 'Gestoppt',
-                'interval': 'N/A',
-                'error': 'Verbindungsfehler'
-            })
+        # Bevorzugt: ein Request an den Collector, der die Daten ohnehin hat
+        api_sources = self.get_aggregate_sources(free_apis, intervals)
+        if api_sources is None:
+            api_sources = self.probe_upstream_sources(free_apis, intervals)
             
         # Santiment API
         santiment_config = config.get('data_sources', {}).get('paid_apis', {}).get('santiment', {})
@@ -250,7 +538,7 @@ class AgentCeliMonitor:
             })
             
         # Liquidation Heatmap (Interne Berechnung)
-        liquidation_file = self.base_dir / 'liquidation_data/liquidation_analysis_latest.json'
+        liquidation_file = self.liquidation_file
         if liquidation_file.exists():
             try:
                 stat = os.stat(liquidation_file)
@@ -276,8 +564,8 @@ class AgentCeliMonitor:
                             'interval': f"{intervals['fast_data']//60} Min",
                             'response_time': 'Berechnung'
                         })
-            except:
-                pass
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                self.logger.debug("Liquidation analysis not readable: %s", e)
         
         return api_sources
     
@@ -286,14 +574,8 @@ class AgentCeliMonitor:
         data_files = []
         
         # JSON Data Files
-        json_patterns = [
-            'correlation_data/*.json',
-            'liquidation_data/*.json',
-            '*.json'
-        ]
-        
-        for pattern in json_patterns:
-            files = glob.glob(str(self.base_dir / pattern))
+        for pattern in self.json_globs:
+            files = glob.glob(pattern)
             for file_path in files[:10]:  # Limit to 10 most recent
                 try:
                     stat = os.stat(file_path)
@@ -302,7 +584,7 @@ class AgentCeliMonitor:
                     
                     file_info = {
                         'name': os.path.basename(file_path),
-                        'path': file_path.replace(str(self.base_dir), ''),
+                        'path': file_path.replace(self.base_dir_str, ''),
                         'size': f"{stat.st_size / 1024:.1f} KB",
                         'modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
                         'records': len(content) if isinstance(content, (list, dict)) else 1,
@@ -313,15 +595,13 @@ class AgentCeliMonitor:
                 except Exception as e:
                     data_files.append({
                         'name': os.path.basename(file_path),
-                        'path': file_path.replace(str(self.base_dir), ''),
+                        'path': file_path.replace(self.base_dir_str, ''),
                         'status': 'error',
                         'error': str(e)[:50]
                     })
         
         # Database Files
-        db_files = ['correlation_data/hybrid_crypto_data.db', 'monitoring.db', 'contact_agent.db']
-        for db_file in db_files:
-            full_path = self.base_dir / db_file
+        for db_file, full_path in self.db_files:
             if full_path.exists():
                 try:
                     conn = sqlite3.connect(full_path)
@@ -363,24 +643,39 @@ class AgentCeliMonitor:
     def get_log_status(self):
         """Log-Dateien Status und letzte Einträge"""
         log_files = []
-        log_dir = self.base_dir / 'logs'
+        log_dir = self.log_dir
         
         if log_dir.exists():
             for log_file in log_dir.glob('*.log'):
                 try:
                     stat = os.stat(log_file)
                     
-                    # Letzte 5 Zeilen lesen
-                    with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                        lines = f.readlines()
-                        recent_lines = lines[-5:] if len(lines) > 5 else lines
+                    # Unveränderte Logs nicht erneut lesen
+                    signature = (stat.st_mtime, stat.st_size)
+                    cached = self.log_cache.get(log_file)
+                    if cached and cached[0] == signature:
+                        _, counted, recent_lines = cached
+                    else:
+                        # Letzte 5 Zeilen vom Dateiende her lesen
+                        recent_lines = [line.strip() for line in read_tail_lines(log_file, 5)]
+                        inode, offset, newlines, last = cached[1] if cached else (None, 0, 0, b'')
+                        if inode != stat.st_ino or stat.st_size < offset:
+                            # Neue oder gekürzte Datei (Rotation) - komplett neu zählen
+                            offset, newlines, last = 0, 0, b''
+                        # Nur den seit dem letzten Lauf angehängten Bereich zählen
+                        added, offset, tail = count_newlines(log_file, offset)
+                        counted = (stat.st_ino, offset, newlines + added, tail or last)
+                        self.log_cache[log_file] = (signature, counted, recent_lines)
+                    _, _, newlines, last = counted
+                    # Letzte Zeile ohne abschließenden Umbruch zählt mit
+                    line_count = newlines + (1 if last and last != b'\n' else 0)
                     
                     log_files.append({
                         'name': log_file.name,
                         'size': f"{stat.st_size / 1024:.1f} KB",
                         'modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
-                        'lines': len(lines),
-                        'recent': [line.strip() for line in recent_lines],
+                        'lines': line_count,
+                        'recent': recent_lines,
                         'status': 'active' if stat.st_mtime > time.time() - 3600 else 'inactive'  # Active if modified in last hour
                     })
                 except Exception as e:
@@ -394,19 +689,27 @@ class AgentCeliMonitor:
     
     def get_current_crypto_data(self):
         """Aktuelle Kryptowährungsdaten"""
+        checked_at, signature, data = self.crypto_cache
+        now = time.monotonic()
+        if now - checked_at < 2.0:
+            return data
+        
         try:
-            # Versuche aktuellen Hybrid-Daten zu laden
-            hybrid_file = self.base_dir / 'correlation_data/hybrid_latest.json'
-            if hybrid_file.exists():
-                with open(hybrid_file, 'r') as f:
-                    return json.load(f)
-            
-            # Fallback: Liquidation-Daten
-            liquidation_file = self.base_dir / 'liquidation_data/liquidation_analysis_latest.json'
-            if liquidation_file.exists():
-                with open(liquidation_file, 'r') as f:
-                    return json.load(f)
+            # Ein stat() statt exists() + stat(); Parse nur bei geänderter mtime
+            for data_file in self.crypto_files:
+                try:
+                    st = data_file.stat()
+                except FileNotFoundError:
+                    continue
+                
+                new_signature = (data_file, st.st_mtime)
+                if new_signature != signature:
+                    with open(data_file, 'r') as f:
+                        data = json.load(f)
+                self.crypto_cache = (now, new_signature, data)
+                return data
             
+            self.crypto_cache = (now, None, {})
             return {}
         except Exception as e:
             self.logger.error(f"Failed to load crypto data: {e}")
@@ -414,50 +717,197 @@ class AgentCeliMonitor:
 
 monitor = AgentCeliMonitor()
 
+@app.before_request
+def throttle_api_requests():
+    """Drosselt zu häufiges Polling der API-Endpunkte"""
+    if not request.path.startswith('/api/'):
+        return None
+    retry_after = rate_limiter.acquire(request.remote_addr)
+    if retry_after:
+        response = jsonify({'error': 'Too many requests'})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(max(1, round(retry_after)))
+        return response
+    return None
+
 @app.route('/')
 def dashboard():
     """Hauptseite des Dashboards"""
-    return render_template('monitoring_dashboard.html')
+    return render_template('monitoring_dashboard.html', poll_interval_ms=POLL_INTERVAL_MS)
+
+def system_payload():
+    return {
+        'processes': monitor.get_system_status(),
+        'timestamp': datetime.now().isoformat()
+    }
+
+def apis_payload():
+    return {
+        'api_sources': monitor.get_api_sources_detail(),
+        'timestamp': datetime.now().isoformat()
+    }
+
+def data_payload():
+    return {
+        'files': monitor.get_data_status(),
+        'timestamp': datetime.now().isoformat()
+    }
+
+def logs_payload():
+    return {
+        'logs': monitor.get_log_status(),
+        'timestamp': datetime.now().isoformat()
+    }
+
+def crypto_payload():
+    return {
+        'data': monitor.get_current_crypto_data(),
+        'timestamp': datetime.now().isoformat()
+    }
+
+# Alle Dashboard-Panels für /api/tick
+TICK_PANELS = {
+    'system': system_payload,
+    'apis': apis_payload,
+    'data': data_payload,
+    'logs': logs_payload,
+    'crypto': crypto_payload
+}
+
+tick_executor = ThreadPoolExecutor(max_workers=len(TICK_PANELS))
+
+def get_panel(key):
+    """Panel aus dem TTL-Cache - liefert ((Payload, bytes, ETag), Cache-Status)"""
+    compute = TICK_PANELS[key]
+    return response_cache.get_or_compute(key, CACHE_TTLS[key], lambda: encode_payload(compute()))
 
 @app.route('/api/system')
 def api_system():
     """System-Status API"""
-    return jsonify({
-        'processes': monitor.get_system_status(),
-        'timestamp': datetime.now().isoformat()
-    })
+    return cached_response('system')
 
 @app.route('/api/apis')
 def api_apis():
     """API-Status API - Neue detaillierte Struktur"""
-    return jsonify({
-        'api_sources': monitor.get_api_sources_detail(),
-        'timestamp': datetime.now().isoformat()
-    })
+    return cached_response('apis')
 
 @app.route('/api/data')
 def api_data():
     """Daten-Status API"""
-    return jsonify({
-        'files': monitor.get_data_status(),
-        'timestamp': datetime.now().isoformat()
-    })
+    return cached_response('data')
 
 @app.route('/api/logs')
 def api_logs():
     """Log-Status API"""
-    return jsonify({
-        'logs': monitor.get_log_status(),
-        'timestamp': datetime.now().isoformat()
-    })
+    return cached_response('logs')
 
 @app.route('/api/crypto')
 def api_crypto():
     """Aktuelle Krypto-Daten API"""
-    return jsonify({
-        'data': monitor.get_current_crypto_data(),
-        'timestamp': datetime.now().isoformat()
-    })
+    return cached_response('crypto')
+
+def compute_tick():
+    """Alle Panels parallel berechnen - liefert ((Payload, bytes, ETag) je Panel, Cache-Status je Panel)"""
+    futures = {key: tick_executor.submit(get_panel, key) for key in TICK_PANELS}
+    
+    entries = {}
+    cache_status = []
+    for key, future in futures.items():
+        try:
+            entries[key], status = future.result()
+        except Exception as e:
+            # Ein fehlerhaftes Panel soll die anderen nicht mitreißen
+            monitor.logger.error(f"Tick panel {key} failed: {e}")
+            entries[key], status = None, 'ERROR'
+        cache_status.append(f"{key}={status}")
+    return entries, cache_status
+
+def panel_etag(entry):
+    # None = Panel fehlgeschlagen oder noch nie verteilt
+    return entry[2] if entry else None
+
+class TickBroadcaster:
+    """Berechnet die Panels einmal je Intervall und schickt Änderungen an alle Stream-Clients"""
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self._subscribers = set()
+        self._panels = {}  # zuletzt verteilter Stand je Panel: (Payload, bytes, ETag) oder None
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    def subscribe(self):
+        """Neuer Client - liefert (Queue, aktueller Stand aller Panels)"""
+        subscription = queue.Queue(maxsize=8)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            return subscription, dict(self._panels)
+    
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+    
+    def _run(self):
+        while True:
+            with self._lock:
+                idle = not self._subscribers
+            if not idle:
+                entries, _ = compute_tick()
+                changed = {
+                    key: entry for key, entry in entries.items()
+                    if panel_etag(entry) != panel_etag(self._panels.get(key))
+                }
+                if changed:
+                    # Aus den gecachten bytes zusammensetzen, an alle Clients verteilen
+                    message = f"data: {join_panels(changed).decode('utf-8')}\n\n"
+                    with self._lock:
+                        self._panels.update(changed)
+                        subscribers = list(self._subscribers)
+                    for subscription in subscribers:
+                        try:
+                            subscription.put_nowait(message)
+                        except queue.Full:
+                            pass  # langsamer Client - bekommt den nächsten Stand
+            time.sleep(self.interval)
+
+tick_broadcaster = TickBroadcaster(STREAM_INTERVAL)
+
+@app.route('/api/tick')
+def api_tick():
+    """Alle Panels in einer Antwort - parallel berechnet statt sechs Requests je Tick"""
+    entries, cache_status = compute_tick()
+    
+    # ETag aus den gespeicherten Panel-ETags - der Body wird dafür nicht erneut gehasht
+    etag = hashlib.blake2b(
+        ','.join(entry[2] if entry else '' for entry in entries.values()).encode('utf-8'),
+        digest_size=16
+    ).hexdigest()
+    response = json_response(join_panels(entries), etag, min(CACHE_TTLS.values()))
+    response.headers['X-Cache'] = ', '.join(cache_status)
+    return response
+
+@app.route('/api/stream')
+def api_stream():
+    """Server-Sent Events: Panel-Änderungen werden gepusht statt gepollt"""
+    subscription, panels = tick_broadcaster.subscribe()
+    
+    def events():
+        try:
+            if panels:
+                yield f"data: {join_panels(panels).decode('utf-8')}\n\n"
+            while True:
+                try:
+                    yield subscription.get(timeout=15)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+        finally:
+            tick_broadcaster.unsubscribe(subscription)
+    
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/api/overview')
 def api_overview():
@@ -488,6 +938,7 @@ if __name__ == '__main__':
     print("✅ Backend-Verbindung: Aktiviert")
     print("📊 Datenquellen: Live-Monitoring")
     print("🌐 Dashboard verfügbar unter: http://localhost:8090")
+    print("💡 Produktion: gunicorn -w 4 -k gevent -b 0.0.0.0:8090 monitoring_dashboard:app")
     print("==================================")
     
     app.run(host='0.0.0.0', port=8090, debug=False, threaded=True)
\ No newline at end of file
@@ -1,8 +1,16 @@
 """Minimal schedule stub used for tests."""
 
+import heapq
+import itertools
+import time
+
+# Heap of (next_run, sequence, job) - the sequence keeps ties in insertion order
 _jobs = []
+_counter = itertools.count()
 
 class Job:
+    __slots__ = ('interval', 'unit', 'func', 'args', 'kwargs')
+
     def __init__(self, interval):
         self.interval = interval
         self.unit = 'seconds'
@@ -10,19 +18,24 @@ class Job:
         self.args = ()
         self.kwargs = {}
 
+    @property
     def seconds(self):
         self.unit = 'seconds'
         return self
 
+    @property
     def minutes(self):
         self.unit = 'minutes'
         return self
 
+    def _seconds(self):
+        return self.interval * 60 if self.unit == 'minutes' else self.interval
+
     def do(self, func, *args, **kwargs):
         self.func = func
         self.args = args
         self.kwargs = kwargs
-        _jobs.append(self)
+        heapq.heappush(_jobs, (time.monotonic() + self._seconds(), next(_counter), self))
         return self
 
 
@@ -31,6 +44,15 @@ def every(interval):
 
 
 def run_pending():
-    for job in list(_jobs):
+    # Only due jobs are popped; each is rescheduled one interval later
+    now = time.monotonic()
+    due = []
+    while _jobs and _jobs[0][0] <= now:
+        due.append(heapq.heappop(_jobs)[2])
+    for job in due:
         job.func(*job.args, **job.kwargs)
-        _jobs.remove(job)
+        heapq.heappush(_jobs, (now + job._seconds(), next(_counter), job))
+
+
+def clear():
+    _jobs.clear()
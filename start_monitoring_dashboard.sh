@@ -28,15 +28,32 @@ echo ""
 if lsof -Pi :8090 -sTCP:LISTEN -t >/dev/null 2>&1; then
     echo "⚠️  Port 8090 ist bereits belegt"
     echo "Beende bestehende Prozesse..."
-    pkill -f "monitoring_dashboard.py"
+    pkill -f "monitoring_dashboard"
     sleep 2
 fi
 
 echo "🚀 Starte Monitoring Dashboard..."
 echo ""
 
-# Start the dashboard
-python3 monitoring_dashboard.py &
+# Start the dashboard - gunicorn bevorzugt, damit langsame Probes nicht alle Requests blockieren
+# Bewusst nur EIN Worker: Antwort-Cache (Single-Flight), Rate-Limit je IP und der
+# SSE-Broadcaster liegen im Prozess - mehrere Worker würden den Cache aufteilen,
+# das Rate-Limit vervielfachen und je Worker eine eigene Poll-Schleife starten.
+# Parallelität kommt aus Greenlets/Threads: jeder offene /api/stream Client belegt
+# dauerhaft eine Verbindung (gevent) bzw. einen Thread (gthread).
+if command -v gunicorn &> /dev/null; then
+    if python3 -c "import gevent" &> /dev/null; then
+        WORKER_ARGS="-k gevent --worker-connections 1000"
+    else
+        # Genug Threads für offene Streams plus normale Requests
+        WORKER_ARGS="-k gthread --threads 64"
+    fi
+    echo "✅ Server: gunicorn -w 1 $WORKER_ARGS"
+    gunicorn -w 1 $WORKER_ARGS -b 0.0.0.0:8090 monitoring_dashboard:app &
+else
+    echo "⚠️  gunicorn nicht gefunden - nutze Flask Entwicklungsserver (pip3 install gunicorn gevent)"
+    python3 monitoring_dashboard.py &
+fi
 DASHBOARD_PID=$!
 
 # Wait for startup
@@ -107,12 +107,15 @@ class AgentCeliAPIServer:
             if not self.agent.collected_data:
                 return jsonify({'error': 'No data available'}), 404
             
+            # One extraction for all coins, read below
+            metrics = self.delivery.extract_metrics(self.agent.collected_data)
+            
             prices = {
                 'timestamp': self.agent.collected_data.get('timestamp'),
-                'btc_usd': self.delivery.get_btc_price(self.agent.collected_data),
-                'eth_usd': self.delivery.get_eth_price(self.agent.collected_data),
-                'sol_usd': self.delivery.get_sol_price(self.agent.collected_data),
-                'xrp_usd': self.delivery.get_xrp_price(self.agent.collected_data),
+                'btc_usd': metrics['BTC']['price'],
+                'eth_usd': metrics['ETH']['price'],
+                'sol_usd': metrics['SOL']['price'],
+                'xrp_usd': metrics['XRP']['price'],
                 'fear_greed_index': self.agent.collected_data.get('fear_greed_index', {}).get('value'),
                 'market_cap_usd': self.agent.collected_data.get('market_metrics', {}).get('global_metrics', {}).get('total_market_cap_usd'),
                 'data_source': 'AgentCeli_LIVE_EXCHANGES'
@@ -156,6 +159,8 @@ class AgentCeliAPIServer:
             if not self.agent.collected_data:
                 return jsonify({'error': 'No data available'}), 404
             
+            metrics = self.delivery.extract_metrics(self.agent.collected_data)
+            
             market_metrics = self.agent.collected_data.get('market_metrics', {})
             fear_greed = self.agent.collected_data.get('fear_greed_index', {})
             
@@ -172,10 +177,10 @@ class AgentCeliAPIServer:
                     'down': market_metrics.get('coins_below_zero', 0)
                 },
                 'top_coins': {
-                    'btc_price': self.delivery.get_btc_price(self.agent.collected_data),
-                    'eth_price': self.delivery.get_eth_price(self.agent.collected_data),
-                    'sol_price': self.delivery.get_sol_price(self.agent.collected_data),
-                    'xrp_price': self.delivery.get_xrp_price(self.agent.collected_data)
+                    'btc_price': metrics['BTC']['price'],
+                    'eth_price': metrics['ETH']['price'],
+                    'sol_price': metrics['SOL']['price'],
+                    'xrp_price': metrics['XRP']['price']
                 },
                 'data_authenticity': 'VERIFIED_LIVE'
             }
@@ -188,29 +193,31 @@ class AgentCeliAPIServer:
             if not self.agent.collected_data:
                 return jsonify({'error': 'No data available'}), 404
             
+            metrics = self.delivery.extract_metrics(self.agent.collected_data)
+            
             correlation_data = {
                 'timestamp': self.agent.collected_data.get('timestamp'),
                 'analysis_ready': True,
                 'coins': {
                     'BTC': {
-                        'price': self.delivery.get_btc_price(self.agent.collected_data),
-                        'volume_24h': self.delivery.get_btc_volume(self.agent.collected_data),
-                        'change_24h_percent': self.delivery.get_btc_change(self.agent.collected_data)
+                        'price': metrics['BTC']['price'],
+                        'volume_24h': metrics['BTC']['volume'],
+                        'change_24h_percent': metrics['BTC']['change']
                     },
                     'ETH': {
-                        'price': self.delivery.get_eth_price(self.agent.collected_data),
-                        'volume_24h': self.delivery.get_eth_volume(self.agent.collected_data),
-                        'change_24h_percent': self.delivery.get_eth_change(self.agent.collected_data)
+                        'price': metrics['ETH']['price'],
+                        'volume_24h': metrics['ETH']['volume'],
+                        'change_24h_percent': metrics['ETH']['change']
                     },
                     'SOL': {
-                        'price': self.delivery.get_sol_price(self.agent.collected_data),
-                        'volume_24h': self.delivery.get_sol_volume(self.agent.collected_data),
-                        'change_24h_percent': self.delivery.get_sol_change(self.agent.collected_data)
+                        'price': metrics['SOL']['price'],
+                        'volume_24h': metrics['SOL']['volume'],
+                        'change_24h_percent': metrics['SOL']['change']
                     },
                     'XRP': {
-                        'price': self.delivery.get_xrp_price(self.agent.collected_data),
-                        'volume_24h': self.delivery.get_xrp_volume(self.agent.collected_data),
-                        'change_24h_percent': self.delivery.get_xrp_change(self.agent.collected_data)
+                        'price': metrics['XRP']['price'],
+                        'volume_24h': metrics['XRP']['volume'],
+                        'change_24h_percent': metrics['XRP']['change']
                     }
                 },
                 'market_indicators': {
@@ -229,6 +236,8 @@ class AgentCeliAPIServer:
             if not self.agent.collected_data:
                 return jsonify({'error': 'No data available'}), 404
             
+            metrics = self.delivery.extract_metrics(self.agent.collected_data)
+            
             # Create CSV in memory
             output = io.StringIO()
             writer = csv.writer(output)
@@ -241,18 +250,18 @@ class AgentCeliAPIServer:
             fear_greed = self.agent.collected_data.get('fear_greed_index', {}).get('value', 0)
             
             coins_data = [
-                ('BTC', self.delivery.get_btc_price(self.agent.collected_data), 
-                 self.delivery.get_btc_volume(self.agent.collected_data), 
-                 self.delivery.get_btc_change(self.agent.collected_data)),
-                ('ETH', self.delivery.get_eth_price(self.agent.collected_data), 
-                 self.delivery.get_eth_volume(self.agent.collected_data), 
-                 self.delivery.get_eth_change(self.agent.collected_data)),
-                ('SOL', self.delivery.get_sol_price(self.agent.collected_data), 
-                 self.delivery.get_sol_volume(self.agent.collected_data), 
-                 self.delivery.get_sol_change(self.agent.collected_data)),
-                ('XRP', self.delivery.get_xrp_price(self.agent.collected_data), 
-                 self.delivery.get_xrp_volume(self.agent.collected_data), 
-                 self.delivery.get_xrp_change(self.agent.collected_data))
+                ('BTC', metrics['BTC']['price'], 
+                 metrics['BTC']['volume'], 
+                 metrics['BTC']['change']),
+                ('ETH', metrics['ETH']['price'], 
+                 metrics['ETH']['volume'], 
+                 metrics['ETH']['change']),
+                ('SOL', metrics['SOL']['price'], 
+                 metrics['SOL']['volume'], 
+                 metrics['SOL']['change']),
+                ('XRP', metrics['XRP']['price'], 
+                 metrics['XRP']['volume'], 
+                 metrics['XRP']['change'])
             ]
             
             for symbol, price, volume, change in coins_data:
@@ -5,11 +5,40 @@ Copy this file to your Agents-main3 repository to access AgentCeli's crypto data
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional fast JSON encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Index DDL for existing collector databases; PRAGMA user_version records it ran,
+# sqlite_master is still checked because a table rebuild drops the indexes
+INDEX_MIGRATIONS = {
+    'idx_live_prices_symbol_ts': "CREATE INDEX IF NOT EXISTS idx_live_prices_symbol_ts ON live_prices(symbol, timestamp DESC)",
+    'idx_live_prices_ts': "CREATE INDEX IF NOT EXISTS idx_live_prices_ts ON live_prices(timestamp)",
+}
+INDEX_SCHEMA_VERSION = 1
+
+# Columns of one exported history row, in query order
+HISTORY_COLUMNS = ('timestamp', 'symbol', 'price', 'volume_24h', 'change_24h', 'fear_greed')
+
+# The bridge is copied into other repositories, so it cannot import agentceli_utils;
+# it keeps this one self-contained encoder (default=str for pandas/numpy values)
+def dump_json(data):
+    """Serialize to compact UTF-8 JSON bytes (unknown types via str)"""
+    if orjson is not None:
+        return orjson.dumps(data, default=str)
+    return json.dumps(data, separators=(',', ':'), default=str).encode('utf-8')
 
 class AgentCeliBridge:
     def __init__(self, agentceli_path="/Users/julius/Desktop/AgentCeli", use_fallback=True):
@@ -28,14 +57,54 @@ class AgentCeliBridge:
         self.data_path = self.agentceli_path / "correlation_data"
         self.db_path = self.data_path / "hybrid_crypto_data.db"
         self.use_fallback = use_fallback
+        self._tls = threading.local()
+        self.ensure_indexes()
+        
+        # Keep-alive pool - repeated API calls reuse the same local connection
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=1))
         
         print("🌉 AgentCeli Bridge initialized for Agents-main3")
     
+    def ensure_indexes(self):
+        """Make sure the history queries can use indexes on live_prices"""
+        if not self.db_path.exists():
+            return
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                # Migrated databases with all indexes in place skip the DDL and ANALYZE
+                version = conn.execute('PRAGMA user_version').fetchone()[0]
+                existing = {row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'live_prices'"
+                )}
+                if version >= INDEX_SCHEMA_VERSION and existing.issuperset(INDEX_MIGRATIONS):
+                    return
+                for ddl in INDEX_MIGRATIONS.values():
+                    conn.execute(ddl)
+                conn.execute('ANALYZE')
+                conn.execute(f'PRAGMA user_version = {INDEX_SCHEMA_VERSION}')
+                conn.commit()
+                print(f"🌉 Database indexes migrated (schema v{version} -> v{INDEX_SCHEMA_VERSION})")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not create index: {e}")
+    
+    def _conn(self):
+        """Read-only connection for the calling thread, opened once"""
+        conn = getattr(self._tls, 'conn', None)
+        if conn is None:
+            # Read-only - never takes a write lock on the collector's database
+            conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+            self._tls.conn = conn
+        return conn
+    
     def get_live_prices(self):
         """Get current crypto prices from AgentCeli"""
         try:
             # Method 1: API (fastest)
-            response = requests.get(f"{self.api_url}/api/prices", timeout=5)
+            response = self.session.get(f"{self.api_url}/api/prices", timeout=5)
             if response.status_code == 200:
                 data = response.json() or {}
                 btc = data.get('btc')
@@ -65,36 +134,29 @@ class AgentCeliBridge:
 
         return None
     
-    def get_historical_data(self, hours=24, symbols=['BTC', 'ETH', 'SOL', 'XRP']):
+    def get_historical_data(self, hours=24, symbols=('BTC', 'ETH', 'SOL', 'XRP')):
         """Get historical data for analysis"""
         try:
             if not self.db_path.exists():
                 print("⚠️ No historical database found")
                 return None
             
-            conn = sqlite3.connect(self.db_path)
+            conn = self._conn()
             
-            # Get data for specified symbols and timeframe
-            placeholders = ','.join(['?' for _ in symbols])
-            query = f"""
-            SELECT 
-                timestamp,
-                symbol,
-                price_usd as price,
-                volume_24h,
-                change_24h,
-                fear_greed
-            FROM live_prices 
-            WHERE symbol IN ({placeholders})
-            AND timestamp > datetime('now', '-{hours} hours')
-            ORDER BY timestamp DESC
-            """
+            # Only placeholders are formatted in; symbols and cutoff are bound
+            placeholders = ','.join('?' * len(symbols))
+            query = (
+                "SELECT timestamp, symbol, price_usd AS price, volume_24h, change_24h, fear_greed "
+                "FROM live_prices WHERE symbol IN (%s) AND timestamp > ? "
+                "ORDER BY timestamp DESC" % placeholders
+            )
             
-            df = pd.read_sql_query(query, conn, params=symbols)
-            conn.close()
+            # Timestamps are stored as unix seconds
+            cutoff = int(time.time()) - int(hours) * 3600
+            df = pd.read_sql_query(query, conn, params=[*symbols, cutoff])
             
             if not df.empty:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
                 print(f"✅ Historical data: {len(df)} records from last {hours} hours")
                 return df
             else:
@@ -105,10 +167,36 @@ class AgentCeliBridge:
             print(f"❌ Database error: {e}")
             return None
     
+    def get_symbol_24h_change(self, symbol, hours=24):
+        """Percent change between the oldest and newest price in the window"""
+        try:
+            if not self.db_path.exists():
+                return None
+            
+            # Two point lookups on the (symbol, timestamp) index instead of loading the window
+            conn = self._conn()
+            cutoff = int(time.time()) - int(hours) * 3600
+            newest = conn.execute(
+                "SELECT price_usd FROM live_prices WHERE symbol = ? AND timestamp > ? "
+                "ORDER BY timestamp DESC LIMIT 1", (symbol, cutoff)
+            ).fetchone()
+            oldest = conn.execute(
+                "SELECT price_usd FROM live_prices WHERE symbol = ? AND timestamp > ? "
+                "ORDER BY timestamp ASC LIMIT 1", (symbol, cutoff)
+            ).fetchone()
+            
+            if not newest or not oldest or not oldest[0]:
+                return None
+            return (newest[0] - oldest[0]) / oldest[0] * 100
+        
+        except sqlite3.Error as e:
+            print(f"❌ Database error: {e}")
+            return None
+    
     def get_market_summary(self):
         """Get market overview and sentiment data"""
         try:
-            response = requests.get(f"{self.api_url}/api/market", timeout=5)
+            response = self.session.get(f"{self.api_url}/api/market", timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 print("✅ Market summary retrieved")
@@ -123,20 +211,28 @@ class AgentCeliBridge:
         try:
             # Get comprehensive data
             live_prices = self.get_live_prices()
-            historical_data = self.get_historical_data(hours=168)  # 7 days
             market_summary = self.get_market_summary()
             
+            # History goes row by row from SQLite to a JSONL side file - no DataFrame in between
+            history_file = Path(filename).with_suffix('.history.jsonl')
+            history_rows = self.stream_history(history_file, hours=168)  # 7 days
+            
             export_data = {
                 "timestamp": datetime.now().isoformat(),
                 "source": "AgentCeli",
                 "live_prices": live_prices,
                 "market_summary": market_summary,
-                "historical_data": historical_data.to_dict('records') if historical_data is not None else None
+                "historical_data": {
+                    "file": str(history_file),
+                    "rows": history_rows,
+                    "columns": HISTORY_COLUMNS,
+                    "timestamp_unit": "unix_seconds"
+                } if history_rows is not None else None
             }
             
-            # Save to Agents-main3 directory
-            with open(filename, 'w') as f:
-                json.dump(export_data, f, indent=2, default=str)
+            # Save to Agents-main3 directory - compact, the export is read by programs
+            with open(filename, 'wb') as f:
+                f.write(dump_json(export_data))
             
             print(f"✅ Data exported to {filename}")
             return export_data
@@ -145,35 +241,77 @@ class AgentCeliBridge:
             print(f"❌ Export failed: {e}")
             return None
     
+    def stream_history(self, path, hours=168, symbols=('BTC', 'ETH', 'SOL', 'XRP'), batch_size=1000):
+        """Write history rows as JSON Lines to path, returns the row count"""
+        if not self.db_path.exists():
+            print("⚠️ No historical database found")
+            return None
+        
+        placeholders = ','.join('?' * len(symbols))
+        query = (
+            "SELECT timestamp, symbol, price_usd, volume_24h, change_24h, fear_greed "
+            "FROM live_prices WHERE symbol IN (%s) AND timestamp > ? "
+            "ORDER BY timestamp DESC" % placeholders
+        )
+        cutoff = int(time.time()) - int(hours) * 3600
+        
+        count = 0
+        cursor = self._conn().execute(query, [*symbols, cutoff])
+        with open(path, 'wb') as f:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                f.writelines(dump_json(dict(zip(HISTORY_COLUMNS, row))) + b'\n' for row in rows)
+                count += len(rows)
+        
+        print(f"✅ Historical data: {count} records streamed to {path}")
+        return count
+    
+    def _probe_api(self):
+        """Status code of /api/status, None if unreachable"""
+        try:
+            return self.session.get(f"{self.api_url}/api/status", timeout=3).status_code
+        except requests.RequestException:
+            return None
+    
+    def _probe_files(self):
+        json_file = self.data_path / "hybrid_latest.json"
+        csv_file = self.data_path / "hybrid_latest.csv"
+        return json_file.exists() and csv_file.exists()
+    
+    def _probe_db(self):
+        return self.db_path.exists()
+    
     def monitor_connection(self):
         """Test connection to AgentCeli system"""
         print("🔍 Testing AgentCeli connection...")
         
+        # Probes run concurrently - total time is the slowest one, not the sum
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            api_future = executor.submit(self._probe_api)
+            files_future = executor.submit(self._probe_files)
+            db_future = executor.submit(self._probe_db)
+            api_status = api_future.result()
+            files_ok = files_future.result()
+            db_ok = db_future.result()
+        
         # Test API
-        try:
-            response = requests.get(f"{self.api_url}/api/status", timeout=3)
-            if response.status_code == 200:
-                print("✅ HTTP API: Connected")
-                api_ok = True
-            else:
-                print("❌ HTTP API: Failed")
-                api_ok = False
-        except:
+        api_ok = api_status == 200
+        if api_ok:
+            print("✅ HTTP API: Connected")
+        elif api_status is None:
             print("❌ HTTP API: Not available")
-            api_ok = False
+        else:
+            print("❌ HTTP API: Failed")
         
         # Test files
-        json_file = self.data_path / "hybrid_latest.json"
-        csv_file = self.data_path / "hybrid_latest.csv"
-        
-        files_ok = json_file.exists() and csv_file.exists()
         if files_ok:
             print("✅ Data files: Available")
         else:
             print("❌ Data files: Missing")
         
         # Test database
-        db_ok = self.db_path.exists()
         if db_ok:
             print("✅ Database: Available")
         else:
@@ -211,9 +349,8 @@ def main():
     historical = bridge.get_historical_data(hours=24)
     if historical is not None:
         print(f"\n📊 Historical Analysis:")
-        btc_data = historical[historical['symbol'] == 'BTC']
-        if len(btc_data) > 0:
-            price_change = ((btc_data['price'].iloc[0] - btc_data['price'].iloc[-1]) / btc_data['price'].iloc[-1]) * 100
+        price_change = bridge.get_symbol_24h_change('BTC')
+        if price_change is not None:
             print(f"  BTC 24h change: {price_change:.2f}%")
             print(f"  Records available: {len(historical)} data points")
     
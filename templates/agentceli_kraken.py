@@ -6,18 +6,65 @@ Collects LIVE crypto data and distributes to:
 - Correlation Systems (Files + Database)
 """
 
-from flask import Flask, jsonify, send_file
+from flask import Flask, jsonify, send_file, request, Response
 from agentceli_free import AgentCeli
+from agentceli_utils import dump_json, dump_json_pretty
 import sqlite3
-import json
-import csv
+import hashlib
+import os
 import threading
 import time
+import atexit
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import MappingProxyType
 import io
 
+# Optional production WSGI server - falls back to Flask's threaded server
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
+
+def write_atomic(path, data):
+    """Write bytes to a temp file and rename it over path - readers see old or new, never half"""
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+# Exchange pair -> stored symbol (Binance USDT pairs, Coinbase -USD pairs)
+PAIR_TO_SYMBOL = {
+    f"{symbol}{suffix}": symbol
+    for symbol in ('BTC', 'ETH', 'SOL', 'XRP', 'ADA', 'DOGE')
+    for suffix in ('USDT', '-USD')
+}
+
 class AgentCeliKraken:
+    # Constant statement text - sqlite3's statement cache reuses the prepared statement
+    _INSERT_PRICE_SQL = (
+        'INSERT INTO price_history '
+        '(timestamp, symbol, price_usd, volume_24h, change_24h_percent, exchange, fear_greed_index) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)'
+    )
+    _TABLE_COLUMNS = {
+        'price_history': (
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp INTEGER NOT NULL, symbol TEXT, '
+            'price_usd REAL, volume_24h REAL, change_24h_percent REAL, exchange TEXT, '
+            'fear_greed_index INTEGER'
+        ),
+        'market_metrics': (
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp INTEGER NOT NULL, total_market_cap REAL, '
+            'total_volume_24h REAL, coins_up INTEGER, coins_down INTEGER, fear_greed_index INTEGER, '
+            'fear_greed_classification TEXT'
+        ),
+    }
+    _INSERT_METRICS_SQL = (
+        'INSERT INTO market_metrics '
+        '(timestamp, total_market_cap, total_volume_24h, coins_up, coins_down, fear_greed_index, fear_greed_classification) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)'
+    )
+    
     def __init__(self):
         """Initialize the Data Kraken"""
         print("🐙 Initializing AgentCeli Data Kraken...")
@@ -31,8 +78,20 @@ class AgentCeliKraken:
         
         # Database for correlation systems
         self.db_path = self.correlation_dir / "crypto_timeseries.db"
+        self._tls = threading.local()
         self.setup_database()
         
+        # JSONL time series stays open - one buffered handle instead of open() per cycle
+        self._jsonl_fp = open(self.correlation_dir / "timeseries_data.jsonl", 'ab', buffering=64 * 1024)
+        atexit.register(self._jsonl_fp.close)
+        
+        # Immutable view for the HTTP handlers, replaced as a whole after each cycle
+        self._snapshot = MappingProxyType({
+            'data': MappingProxyType({}),
+            'last_update': None,
+            'payloads': MappingProxyType({})  # name -> (bytes, ETag)
+        })
+        
         # Flask API for websites
         self.app = Flask(__name__)
         self.setup_website_api()
@@ -40,46 +99,91 @@ class AgentCeliKraken:
         # Control flags
         self.is_running = False
         self.update_interval = 300  # 5 minutes
+        self.retention_days = 7  # raw price_history rows, hourly rollups are kept
+        self._rollup_hour = None
         
         print("🐙 AgentCeli Data Kraken ready!")
     
     def setup_database(self):
         """Setup database for correlation systems"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn()
         cursor = conn.cursor()
         
-        # Time series table
+        # WAL persists in the file - readers no longer block the writer
+        cursor.execute('PRAGMA journal_mode=WAL')
+        
+        # Time series table + market metrics table
+        for table, columns in self._TABLE_COLUMNS.items():
+            cursor.execute(f'CREATE TABLE IF NOT EXISTS {table} ({columns})')
+            self.migrate_epoch_timestamps(cursor, table)
+        
+        # Hourly averages - kept after raw rows leave the retention window
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS price_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT,
-                symbol TEXT,
+            CREATE TABLE IF NOT EXISTS price_history_hourly (
+                hour INTEGER NOT NULL,
+                symbol TEXT NOT NULL,
                 price_usd REAL,
                 volume_24h REAL,
                 change_24h_percent REAL,
-                exchange TEXT,
-                fear_greed_index INTEGER
+                samples INTEGER,
+                PRIMARY KEY (symbol, hour)
             )
         ''')
         
-        # Market metrics table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS market_metrics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT,
-                total_market_cap REAL,
-                total_volume_24h REAL,
-                coins_up INTEGER,
-                coins_down INTEGER,
-                fear_greed_index INTEGER,
-                fear_greed_classification TEXT
-            )
-        ''')
+        # Range scans per symbol / time window instead of full table scans
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_price_history_symbol_ts ON price_history(symbol, timestamp DESC)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_market_metrics_ts ON market_metrics(timestamp DESC)')
+        cursor.execute('ANALYZE')
         
         conn.commit()
-        conn.close()
         print("📊 Database initialized for correlation systems")
     
+    def migrate_epoch_timestamps(self, cursor, table):
+        """Convert a legacy ISO-text timestamp column to unix seconds"""
+        columns = {row[1]: row[2] for row in cursor.execute(f'PRAGMA table_info({table})')}
+        if columns.get('timestamp', '').upper() != 'TEXT':
+            return
+        
+        # ISO rows were written as naive local time; rows already stored as
+        # epoch digits under TEXT affinity keep their integer value
+        select = [
+            "CASE WHEN CAST(timestamp AS INTEGER) || '' = timestamp THEN CAST(timestamp AS INTEGER) "
+            "ELSE CAST(strftime('%s', timestamp, 'utc') AS INTEGER) END" if name == 'timestamp' else name
+            for name in columns
+        ]
+        
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            cursor.execute(f'ALTER TABLE {table} RENAME TO {table}_text')
+            cursor.execute(f'CREATE TABLE {table} ({self._TABLE_COLUMNS[table]})')
+            cursor.execute(
+                f'INSERT INTO {table} ({", ".join(columns)}) '
+                f'SELECT {", ".join(select)} FROM {table}_text WHERE timestamp IS NOT NULL'
+            )
+            cursor.execute(f'DROP TABLE {table}_text')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+        cursor.execute('COMMIT')
+        print(f"📊 Migrated {table} timestamps to unix seconds")
+    
+    def _conn(self):
+        """Connection for the calling thread, opened and tuned once"""
+        conn = getattr(self._tls, 'conn', None)
+        if conn is None:
+            # Autocommit mode - write transactions are opened explicitly
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            self.apply_pragmas(conn)
+            self._tls.conn = conn
+        return conn
+    
+    def apply_pragmas(self, conn):
+        """Per-connection tuning: fewer fsyncs, larger cache, memory-mapped reads"""
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA cache_size=-65536')
+        conn.execute('PRAGMA mmap_size=268435456')
+        conn.execute('PRAGMA temp_store=MEMORY')
+    
     def collect_and_distribute(self):
         """Core function: Collect data and distribute to all systems"""
         print(f"🐙 Kraken collecting data at {datetime.now().strftime('%H:%M:%S')}")
@@ -87,21 +191,84 @@ class AgentCeliKraken:
         # Collect LIVE data
         self.agent.collect_all_data()
         
-        if not self.agent.collected_data:
+        # The agent rebinds collected_data per run - this reference stays fixed for the cycle
+        data = self.agent.collected_data
+        if not data:
             print("❌ No data collected")
             return
         
         # Distribute to correlation systems (files + database)
-        self.save_for_correlation_systems()
+        self.save_for_correlation_systems(data)
         
-        # Website API data is automatically available via self.agent.collected_data
+        # Website API bodies are serialized here, not on every request
+        self.publish_snapshot(data)
         
         print("🐙 Data distributed to all systems!")
     
-    def save_for_correlation_systems(self):
+    def publish_snapshot(self, data):
+        """Serialize the website API responses and publish them with the data"""
+        live_data = data.get('live_exchange_data', {}).get('binance', {})
+        btc_data = live_data.get('BTCUSDT', {})
+        market_metrics = data.get('market_metrics', {})
+        fear_greed = data.get('fear_greed_index', {})
+        
+        bodies = {
+            'prices': {
+                'timestamp': data.get('timestamp'),
+                'source': 'AgentCeli_Kraken',
+                'btc': btc_data.get('current_price', 0),
+                'eth': live_data.get('ETHUSDT', {}).get('current_price', 0),
+                'sol': live_data.get('SOLUSDT', {}).get('current_price', 0),
+                'xrp': live_data.get('XRPUSDT', {}).get('current_price', 0),
+                'fear_greed': fear_greed.get('value'),
+                'market_cap': market_metrics.get('global_metrics', {}).get('total_market_cap_usd')
+            },
+            'btc': {
+                'symbol': 'BTC',
+                'price': btc_data.get('current_price', 0),
+                'change_24h': btc_data.get('change_24h', 0),
+                'volume': btc_data.get('volume_24h', 0),
+                'timestamp': data.get('timestamp')
+            },
+            'market': {
+                'market_cap': market_metrics.get('global_metrics', {}).get('total_market_cap_usd'),
+                'fear_greed': {
+                    'value': fear_greed.get('value'),
+                    'classification': fear_greed.get('value_classification')
+                },
+                'coins_up': market_metrics.get('coins_above_zero', 0),
+                'coins_down': market_metrics.get('coins_below_zero', 0),
+                'timestamp': data.get('timestamp')
+            }
+        }
+        
+        payloads = {}
+        for name, body in bodies.items():
+            raw = dump_json(body)
+            payloads[name] = (raw, hashlib.sha1(raw).hexdigest())
+        # Single reference assignment - handlers never see a half-updated state
+        self._snapshot = MappingProxyType({
+            'data': MappingProxyType(dict(data)),
+            'last_update': self.agent.last_update,
+            'payloads': MappingProxyType(payloads)
+        })
+    
+    def payload_response(self, name, error):
+        """Serve a pre-serialized body with ETag / 304 support"""
+        payload = self._snapshot['payloads'].get(name)
+        if payload is None:
+            return jsonify({'error': error}), 404
+        
+        body, etag = payload
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = 60
+        return response.make_conditional(request)
+    
+    def save_for_correlation_systems(self, data):
         """Save data for correlation analysis"""
         timestamp = datetime.now()
-        data = self.agent.collected_data
         
         # 1. Save to database (time series)
         self.save_to_database(data, timestamp)
@@ -114,98 +281,141 @@ class AgentCeliKraken:
         
         # 4. Archive hourly (for historical correlation)
         if timestamp.minute == 0:  # Every hour
-            self.create_hourly_archive(timestamp)
+            self.create_hourly_archive(timestamp, data)
+        
+        # 5. Roll up finished hours and prune raw rows once per hour
+        hour = timestamp.replace(minute=0, second=0, microsecond=0)
+        if hour != self._rollup_hour:
+            self.rollup_and_prune(hour)
+            self._rollup_hour = hour
     
     def save_to_database(self, data, timestamp):
         """Save to database for correlation systems"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        conn = self._conn()
         
-        ts_str = timestamp.isoformat()
+        # Unix seconds - compared as integers, no per-row date parsing
+        ts_epoch = int(timestamp.timestamp())
         fear_greed = data.get('fear_greed_index', {})
         fg_value = fear_greed.get('value') if fear_greed else None
         
         # Save individual coin prices
         live_exchanges = data.get('live_exchange_data', {})
         
+        price_rows = []
         for exchange, exchange_data in live_exchanges.items():
             for pair, pair_data in exchange_data.items():
-                # Map to standard symbols
-                symbol = pair.replace('USDT', '').replace('-USD', '')
-                if symbol in ['BTC', 'ETH', 'SOL', 'XRP', 'ADA', 'DOGE']:
-                    cursor.execute('''
-                        INSERT INTO price_history 
-                        (timestamp, symbol, price_usd, volume_24h, change_24h_percent, exchange, fear_greed_index)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        ts_str, symbol, 
-                        pair_data.get('current_price'),
-                        pair_data.get('volume_24h'),
-                        pair_data.get('change_24h'),
-                        exchange,
-                        fg_value
-                    ))
+                # Map to standard symbols, skipping untracked pairs
+                symbol = PAIR_TO_SYMBOL.get(pair)
+                if symbol is None:
+                    continue
+                price_rows.append((
+                    ts_epoch, symbol, 
+                    pair_data.get('current_price'),
+                    pair_data.get('volume_24h'),
+                    pair_data.get('change_24h'),
+                    exchange,
+                    fg_value
+                ))
         
         # Save market metrics
         market_metrics = data.get('market_metrics', {})
         global_metrics = market_metrics.get('global_metrics', {})
         
-        cursor.execute('''
-            INSERT INTO market_metrics 
-            (timestamp, total_market_cap, total_volume_24h, coins_up, coins_down, fear_greed_index, fear_greed_classification)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            ts_str,
+        metrics_row = (
+            ts_epoch,
             global_metrics.get('total_market_cap_usd'),
             global_metrics.get('total_volume_24h_usd'),
             market_metrics.get('coins_above_zero'),
             market_metrics.get('coins_below_zero'),
             fg_value,
             fear_greed.get('value_classification') if fear_greed else None
-        ))
+        )
+        
+        # One write transaction per cycle; IMMEDIATE takes the write lock up front
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(self._INSERT_PRICE_SQL, price_rows)
+            conn.execute(self._INSERT_METRICS_SQL, metrics_row)
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
         
-        conn.commit()
-        conn.close()
         print("💾 Data saved to correlation database")
     
+    def rollup_and_prune(self, hour):
+        """Aggregate complete hours into price_history_hourly and drop expired raw rows"""
+        conn = self._conn()
+        hour_start = int(hour.timestamp())
+        cutoff = hour_start - self.retention_days * 86400
+        
+        # Resume after the last rolled-up hour so missed hours are caught up
+        last_hour = conn.execute('SELECT MAX(hour) FROM price_history_hourly').fetchone()[0]
+        if last_hour is None:
+            # First rollup: start at the oldest raw row so nothing is pruned unaggregated
+            oldest = conn.execute('SELECT MIN(timestamp) FROM price_history').fetchone()[0]
+            since = hour_start if oldest is None else oldest // 3600 * 3600
+        else:
+            since = last_hour + 3600
+        
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('''
+                INSERT OR REPLACE INTO price_history_hourly
+                (hour, symbol, price_usd, volume_24h, change_24h_percent, samples)
+                SELECT timestamp / 3600 * 3600 AS h, symbol,
+                       AVG(price_usd), AVG(volume_24h), AVG(change_24h_percent), COUNT(*)
+                FROM price_history
+                WHERE timestamp >= ? AND timestamp < ?
+                GROUP BY symbol, h
+            ''', (since, hour_start))
+            conn.execute('DELETE FROM price_history WHERE timestamp < ?', (cutoff,))
+            conn.execute('DELETE FROM market_metrics WHERE timestamp < ?', (cutoff,))
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        
+        # Refreshes planner statistics only where they went stale
+        conn.execute('PRAGMA optimize')
+        print("🗜️ Hourly rollup done, raw history pruned")
+    
     def save_latest_csv(self, data, timestamp):
         """Save latest data as CSV for correlation systems"""
         csv_file = self.correlation_dir / "latest_prices.csv"
         
-        with open(csv_file, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['timestamp', 'symbol', 'price_usd', 'volume_24h', 'change_24h', 'fear_greed'])
-            
-            fear_greed_value = data.get('fear_greed_index', {}).get('value', 0)
-            live_exchanges = data.get('live_exchange_data', {})
-            
-            # Extract data from Binance (most complete)
-            binance_data = live_exchanges.get('binance', {})
-            
-            coins = [
-                ('BTC', binance_data.get('BTCUSDT', {})),
-                ('ETH', binance_data.get('ETHUSDT', {})),
-                ('SOL', binance_data.get('SOLUSDT', {})),
-                ('XRP', binance_data.get('XRPUSDT', {}))
-            ]
-            
-            for symbol, coin_data in coins:
-                if coin_data:
-                    writer.writerow([
-                        timestamp.isoformat(),
-                        symbol,
-                        coin_data.get('current_price', 0),
-                        coin_data.get('volume_24h', 0),
-                        coin_data.get('change_24h', 0),
-                        fear_greed_value
-                    ])
+        fear_greed_value = data.get('fear_greed_index', {}).get('value', 0)
+        live_exchanges = data.get('live_exchange_data', {})
+        
+        # Extract data from Binance (most complete)
+        binance_data = live_exchanges.get('binance', {})
+        
+        coins = [
+            ('BTC', binance_data.get('BTCUSDT', {})),
+            ('ETH', binance_data.get('ETHUSDT', {})),
+            ('SOL', binance_data.get('SOLUSDT', {})),
+            ('XRP', binance_data.get('XRPUSDT', {}))
+        ]
+        
+        # All cells are numbers or fixed symbols - no CSV quoting needed
+        def cell(value):
+            return '' if value is None else value
+        
+        ts = timestamp.isoformat()
+        fg = cell(fear_greed_value)
+        body = 'timestamp,symbol,price_usd,volume_24h,change_24h,fear_greed\n' + ''.join(
+            f"{ts},{symbol},{cell(coin_data.get('current_price', 0))},"
+            f"{cell(coin_data.get('volume_24h', 0))},{cell(coin_data.get('change_24h', 0))},{fg}\n"
+            for symbol, coin_data in coins if coin_data
+        )
+        
+        # Written whole and renamed into place - /correlation/csv never serves a torn file
+        write_atomic(csv_file, body.encode('utf-8'))
         
         print("📊 Latest CSV saved for correlation analysis")
     
     def save_json_timeseries(self, data, timestamp):
         """Save JSON time series for detailed correlation analysis"""
-        json_file = self.correlation_dir / "timeseries_data.jsonl"  # JSON Lines format
-        
         # Create correlation-ready data point
         data_point = {
             'timestamp': timestamp.isoformat(),
@@ -227,20 +437,19 @@ class AgentCeliKraken:
                 data_point['volumes'][symbol] = pair_data.get('volume_24h')
                 data_point['changes'][symbol] = pair_data.get('change_24h')
         
-        # Append to JSONL file
-        with open(json_file, 'a') as f:
-            f.write(json.dumps(data_point) + '\n')
+        # Append to JSONL file - flushed so tailing readers see whole lines
+        self._jsonl_fp.write(dump_json(data_point) + b'\n')
+        self._jsonl_fp.flush()
         
         print("📈 JSON time series updated")
     
-    def create_hourly_archive(self, timestamp):
+    def create_hourly_archive(self, timestamp, data):
         """Create hourly archive for historical correlation"""
         hour_str = timestamp.strftime('%Y%m%d_%H')
         archive_file = self.correlation_dir / f"archive_{hour_str}.json"
         
-        if self.agent.collected_data:
-            with open(archive_file, 'w') as f:
-                json.dump(self.agent.collected_data, f, indent=2)
+        if data:
+            write_atomic(archive_file, dump_json_pretty(data))
             print(f"📁 Hourly archive created: {archive_file}")
     
     def setup_website_api(self):
@@ -249,67 +458,29 @@ class AgentCeliKraken:
         @self.app.route('/api/status')
         def status():
             """Health check for websites"""
-            return jsonify({
+            snap = self._snapshot
+            last_update = snap['last_update']
+            return Response(dump_json({
                 'status': 'kraken_active',
-                'last_update': self.agent.last_update.isoformat() if self.agent.last_update else None,
-                'data_available': bool(self.agent.collected_data),
+                'last_update': last_update.isoformat() if last_update else None,
+                'data_available': bool(snap['data']),
                 'timestamp': datetime.now().isoformat()
-            })
+            }), mimetype='application/json')
         
         @self.app.route('/api/prices')
         def get_prices():
             """Live prices for websites"""
-            if not self.agent.collected_data:
-                return jsonify({'error': 'No data available'}), 404
-            
-            live_data = self.agent.collected_data.get('live_exchange_data', {}).get('binance', {})
-            
-            return jsonify({
-                'timestamp': self.agent.collected_data.get('timestamp'),
-                'source': 'AgentCeli_Kraken',
-                'btc': live_data.get('BTCUSDT', {}).get('current_price', 0),
-                'eth': live_data.get('ETHUSDT', {}).get('current_price', 0),
-                'sol': live_data.get('SOLUSDT', {}).get('current_price', 0),
-                'xrp': live_data.get('XRPUSDT', {}).get('current_price', 0),
-                'fear_greed': self.agent.collected_data.get('fear_greed_index', {}).get('value'),
-                'market_cap': self.agent.collected_data.get('market_metrics', {}).get('global_metrics', {}).get('total_market_cap_usd')
-            })
+            return self.payload_response('prices', 'No data available')
         
         @self.app.route('/api/btc')
         def get_btc_only():
             """Just BTC - fastest for websites"""
-            if not self.agent.collected_data:
-                return jsonify({'error': 'No data'}), 404
-            
-            btc_data = self.agent.collected_data.get('live_exchange_data', {}).get('binance', {}).get('BTCUSDT', {})
-            
-            return jsonify({
-                'symbol': 'BTC',
-                'price': btc_data.get('current_price', 0),
-                'change_24h': btc_data.get('change_24h', 0),
-                'volume': btc_data.get('volume_24h', 0),
-                'timestamp': self.agent.collected_data.get('timestamp')
-            })
+            return self.payload_response('btc', 'No data')
         
         @self.app.route('/api/market')
         def get_market():
             """Market summary for websites"""
-            if not self.agent.collected_data:
-                return jsonify({'error': 'No data'}), 404
-            
-            market_metrics = self.agent.collected_data.get('market_metrics', {})
-            fear_greed = self.agent.collected_data.get('fear_greed_index', {})
-            
-            return jsonify({
-                'market_cap': market_metrics.get('global_metrics', {}).get('total_market_cap_usd'),
-                'fear_greed': {
-                    'value': fear_greed.get('value'),
-                    'classification': fear_greed.get('value_classification')
-                },
-                'coins_up': market_metrics.get('coins_above_zero', 0),
-                'coins_down': market_metrics.get('coins_below_zero', 0),
-                'timestamp': self.agent.collected_data.get('timestamp')
-            })
+            return self.payload_response('market', 'No data')
         
         @self.app.route('/correlation/csv')
         def download_csv():
@@ -367,8 +538,11 @@ class AgentCeliKraken:
         # Start data collection
         self.start_kraken()
         
-        # Start web server
-        self.app.run(host='0.0.0.0', port=port, debug=False)
+        # Start web server - KRAKEN_DEV forces the Werkzeug dev server
+        if serve is not None and not os.getenv('KRAKEN_DEV'):
+            serve(self.app, host='0.0.0.0', port=port, threads=8, ident='kraken')
+        else:
+            self.app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
 
 def main():
     """Start AgentCeli Data Kraken"""
@@ -4,11 +4,36 @@ AgentCeli Data Delivery Methods
 Simple ways to send REAL crypto data to your website or correlation system
 """
 
+import csv
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import sqlite3
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
+from agentceli_utils import dump_json, dump_json_pretty
+
+# Pooled keep-alive session - repeated posts to the same website reuse the connection
+_SESSION = requests.Session()
+_SESSION.headers['User-Agent'] = 'AgentCeli-Delivery/1.0'
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                       max_retries=Retry(total=2, backoff_factor=0.1))
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.mount('http://', _ADAPTER)
+
+# Shared read-only default for .get() chains - no new dict per missing key
+_EMPTY = MappingProxyType({})
+
+# (symbol, Binance pair, Coinbase pair, CoinGecko id)
+TRACKED_COINS = (
+    ('BTC', 'BTCUSDT', 'BTC-USD', 'bitcoin'),
+    ('ETH', 'ETHUSDT', 'ETH-USD', 'ethereum'),
+    ('SOL', 'SOLUSDT', 'SOL-USD', 'solana'),
+    ('XRP', 'XRPUSDT', 'XRP-USD', 'xrp'),
+)
+_COINS_BY_SYMBOL = {coin[0]: coin for coin in TRACKED_COINS}
 
 class DataDelivery:
     def __init__(self):
@@ -19,19 +44,22 @@ class DataDelivery:
         """Send data to your website via HTTP POST"""
         try:
             # Prepare payload
+            metrics = self.extract_metrics(data)
             payload = {
                 'timestamp': data.get('timestamp'),
                 'source': 'AgentCeli_REAL_DATA',
-                'btc_price': self.get_btc_price(data),
-                'eth_price': self.get_eth_price(data),
-                'sol_price': self.get_sol_price(data),
-                'xrp_price': self.get_xrp_price(data),
+                'btc_price': metrics['BTC']['price'],
+                'eth_price': metrics['ETH']['price'],
+                'sol_price': metrics['SOL']['price'],
+                'xrp_price': metrics['XRP']['price'],
                 'fear_greed': data.get('fear_greed_index', {}).get('value'),
                 'market_cap': data.get('market_metrics', {}).get('global_metrics', {}).get('total_market_cap_usd'),
                 'data_authenticity': 'VERIFIED_LIVE'
             }
             
-            response = requests.post(website_url, json=payload, timeout=10)
+            # Body encoded here (orjson when available) instead of by requests' stdlib encoder
+            response = _SESSION.post(website_url, data=dump_json(payload),
+                                     headers={'Content-Type': 'application/json'}, timeout=10)
             if response.status_code == 200:
                 print(f"✅ Data sent to website: {website_url}")
                 return True
@@ -47,27 +75,13 @@ class DataDelivery:
         """Save data in format for correlation analysis"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        # Create correlation data structure
+        # Create correlation data structure - one extraction pass for all symbols
+        metrics = self.extract_metrics(data)
         correlation_data = {
             'timestamp': data.get('timestamp'),
-            'prices': {
-                'BTC': self.get_btc_price(data),
-                'ETH': self.get_eth_price(data), 
-                'SOL': self.get_sol_price(data),
-                'XRP': self.get_xrp_price(data)
-            },
-            'volumes': {
-                'BTC': self.get_btc_volume(data),
-                'ETH': self.get_eth_volume(data),
-                'SOL': self.get_sol_volume(data),
-                'XRP': self.get_xrp_volume(data)
-            },
-            'changes_24h': {
-                'BTC': self.get_btc_change(data),
-                'ETH': self.get_eth_change(data),
-                'SOL': self.get_sol_change(data),
-                'XRP': self.get_xrp_change(data)
-            },
+            'prices': {symbol: m['price'] for symbol, m in metrics.items()},
+            'volumes': {symbol: m['volume'] for symbol, m in metrics.items()},
+            'changes_24h': {symbol: m['change'] for symbol, m in metrics.items()},
             'market_metrics': {
                 'fear_greed_index': data.get('fear_greed_index', {}).get('value'),
                 'total_market_cap': data.get('market_metrics', {}).get('global_metrics', {}).get('total_market_cap_usd'),
@@ -79,15 +93,21 @@ class DataDelivery:
         
         # Save as JSON
         json_file = self.output_dir / f"correlation_data_{timestamp}.json"
-        with open(json_file, 'w') as f:
-            json.dump(correlation_data, f, indent=2)
+        with open(json_file, 'wb') as f:
+            f.write(dump_json_pretty(correlation_data))
         
         # Save as CSV for easy import
         csv_file = self.output_dir / f"correlation_data_{timestamp}.csv"
-        with open(csv_file, 'w') as f:
-            f.write("timestamp,symbol,price,volume,change_24h,fear_greed\n")
-            for symbol in ['BTC', 'ETH', 'SOL', 'XRP']:
-                f.write(f"{data.get('timestamp')},{symbol},{correlation_data['prices'][symbol]},{correlation_data['volumes'][symbol]},{correlation_data['changes_24h'][symbol]},{correlation_data['market_metrics']['fear_greed_index']}\n")
+        # One buffered handle, rows handed to csv.writer in a single call
+        with open(csv_file, 'w', newline='', encoding='utf-8', buffering=64 * 1024) as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(['timestamp', 'symbol', 'price', 'volume', 'change_24h', 'fear_greed'])
+            timestamp_value = data.get('timestamp')
+            fear_greed = correlation_data['market_metrics']['fear_greed_index']
+            writer.writerows(
+                (timestamp_value, symbol, m['price'], m['volume'], m['change'], fear_greed)
+                for symbol, m in metrics.items()
+            )
         
         print(f"📊 Correlation data saved:")
         print(f"   JSON: {json_file}")
@@ -97,135 +117,104 @@ class DataDelivery:
     
     def create_simple_api(self, data: dict, port: int = 8080):
         """Create simple HTTP server to serve data"""
-        from http.server import HTTPServer, BaseHTTPRequestHandler
-        import json
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+        
+        # data is fixed for the server's lifetime - serialize the response once
+        metrics = self.extract_metrics(data)
+        api_data = {
+            'status': 'live',
+            'timestamp': data.get('timestamp'),
+            'btc': metrics['BTC']['price'],
+            'eth': metrics['ETH']['price'],
+            'sol': metrics['SOL']['price'],
+            'xrp': metrics['XRP']['price'],
+            'fear_greed': data.get('fear_greed_index', {}).get('value'),
+            'source': 'AgentCeli_REAL_DATA'
+        }
         
         class DataHandler(BaseHTTPRequestHandler):
             def do_GET(self):
                 if self.path == '/crypto-data':
                     self.send_response(200)
                     self.send_header('Content-type', 'application/json')
+                    self.send_header('Content-Length', str(self.server.payload_len))
                     self.send_header('Access-Control-Allow-Origin', '*')
                     self.end_headers()
-                    
-                    api_data = {
-                        'status': 'live',
-                        'timestamp': data.get('timestamp'),
-                        'btc': self.server.delivery.get_btc_price(data),
-                        'eth': self.server.delivery.get_eth_price(data),
-                        'sol': self.server.delivery.get_sol_price(data),
-                        'xrp': self.server.delivery.get_xrp_price(data),
-                        'fear_greed': data.get('fear_greed_index', {}).get('value'),
-                        'source': 'AgentCeli_REAL_DATA'
-                    }
-                    
-                    self.wfile.write(json.dumps(api_data).encode())
+                    self.wfile.write(self.server.payload)
                 else:
                     self.send_response(404)
                     self.end_headers()
         
-        server = HTTPServer(('localhost', port), DataHandler)
+        server = ThreadingHTTPServer(('localhost', port), DataHandler)
         server.delivery = self
+        server.payload = dump_json(api_data)
+        server.payload_len = len(server.payload)
         print(f"🌐 Simple API running on http://localhost:{port}/crypto-data")
         return server
     
     # Helper methods to extract prices from different sources
-    def get_btc_price(self, data: dict) -> float:
-        # Try live exchange data first
-        live_data = data.get('live_exchange_data', {})
-        
-        if 'binance' in live_data and 'BTCUSDT' in live_data['binance']:
-            return live_data['binance']['BTCUSDT']['current_price']
-        elif 'coinbase' in live_data and 'BTC-USD' in live_data['coinbase']:
-            return live_data['coinbase']['BTC-USD']['current_price']
-        elif 'bitcoin' in data.get('coins', {}):
-            return data['coins']['bitcoin']['price_usd']
-        
-        return 0.0
-    
-    def get_eth_price(self, data: dict) -> float:
-        live_data = data.get('live_exchange_data', {})
-        
-        if 'binance' in live_data and 'ETHUSDT' in live_data['binance']:
-            return live_data['binance']['ETHUSDT']['current_price']
-        elif 'coinbase' in live_data and 'ETH-USD' in live_data['coinbase']:
-            return live_data['coinbase']['ETH-USD']['current_price']
-        elif 'ethereum' in data.get('coins', {}):
-            return data['coins']['ethereum']['price_usd']
-        
-        return 0.0
+    def extract_metrics(self, data: dict) -> dict:
+        """Price, volume and 24h change per symbol - call once per export and read from the result"""
+        return {coin[0]: self._coin_metrics(data, coin) for coin in TRACKED_COINS}
     
-    def get_sol_price(self, data: dict) -> float:
-        live_data = data.get('live_exchange_data', {})
-        
-        if 'binance' in live_data and 'SOLUSDT' in live_data['binance']:
-            return live_data['binance']['SOLUSDT']['current_price']
-        elif 'coinbase' in live_data and 'SOL-USD' in live_data['coinbase']:
-            return live_data['coinbase']['SOL-USD']['current_price']
-        elif 'solana' in data.get('coins', {}):
-            return data['coins']['solana']['price_usd']
-        
-        return 0.0
+    def _coin_metrics(self, data: dict, coin: tuple) -> dict:
+        """Price, volume and 24h change for one TRACKED_COINS entry"""
+        _, binance_pair, coinbase_pair, coin_id = coin
+        live_data = data.get('live_exchange_data', _EMPTY)
+        
+        # One probe per source: Binance, then Coinbase, then the CoinGecko coin list
+        pair_data = live_data.get('binance', _EMPTY).get(binance_pair)
+        if pair_data is not None:
+            price = pair_data['current_price']
+        elif (coinbase_data := live_data.get('coinbase', _EMPTY).get(coinbase_pair)) is not None:
+            price = coinbase_data['current_price']
+        elif (coin_data := data.get('coins', _EMPTY).get(coin_id)) is not None:
+            price = coin_data['price_usd']
+        else:
+            price = 0.0
+        
+        # Volume and change only come from Binance
+        return {
+            'price': price,
+            'volume': pair_data['volume_24h'] if pair_data is not None else 0.0,
+            'change': pair_data['change_24h'] if pair_data is not None else 0.0
+        }
     
-    def get_xrp_price(self, data: dict) -> float:
-        live_data = data.get('live_exchange_data', {})
-        
-        if 'binance' in live_data and 'XRPUSDT' in live_data['binance']:
-            return live_data['binance']['XRPUSDT']['current_price']
-        elif 'coinbase' in live_data and 'XRP-USD' in live_data['coinbase']:
-            return live_data['coinbase']['XRP-USD']['current_price']
-        elif 'xrp' in data.get('coins', {}):
-            return data['coins']['xrp']['price_usd']
-        
-        return 0.0
+    def get_btc_price(self, data: dict) -> float:
+        return self._coin_metrics(data, _COINS_BY_SYMBOL['BTC'])['price']
     
     def get_btc_volume(self, data: dict) -> float:
-        live_data = data.get('live_exchange_data', {})
-        if 'binance' in live_data and 'BTCUSDT' in live_data['binance']:
-            return live_data['binance']['BTCUSDT']['volume_24h']
-        return 0.0
-    
-    def get_eth_volume(self, data: dict) -> float:
-        live_data = data.get('live_exchange_data', {})
-        if 'binance' in live_data and 'ETHUSDT' in live_data['binance']:
-            return live_data['binance']['ETHUSDT']['volume_24h']
-        return 0.0
+        return self._coin_metrics(data, _COINS_BY_SYMBOL['BTC'])['volume']
     
-    def get_sol_volume(self, data: dict) -> float:
-        live_data = data.get('live_exchange_data', {})
-        if 'binance' in live_data and 'SOLUSDT' in live_data['binance']:
-            return live_data['binance']['SOLUSDT']['volume_24h']
-        return 0.0
+    def get_btc_change(self, data: dict) -> float:
+        return self._coin_metrics(data, _COINS_BY_SYMBOL['BTC'])['change']
     
-    def get_xrp_volume(self, data: dict) -> float:
-        live_data = data.get('live_exchange_data', {})
-        if 'binance' in live_data and 'XRPUSDT' in live_data['binance']:
-            return live_data['binance']['XRPUSDT']['volume_24h']
-        return 0.0
+    def get_eth_price(self, data: dict) -> float:
+        return self._coin_metrics(data, _COINS_BY_SYMBOL['ETH'])['price']
     
-    def get_btc_change(self, data: dict) -> float:
-        live_data = data.get('live_exchange_data', {})
-        if 'binance' in live_data and 'BTCUSDT' in live_data['binance']:
-            return live_data['binance']['BTCUSDT']['change_24h']
-        return 0.0
+    def get_eth_volume(self, data: dict) -> float:
+        return self._coin_metrics(data, _COINS_BY_SYMBOL['ETH'])['volume']
     
     def get_eth_change(self, data: dict) -> float:
-        live_data = data.get('live_exchange_data', {})
-        if 'binance' in live_data and 'ETHUSDT' in live_data['binance']:
-            return live_data['binance']['ETHUSDT']['change_24h']
-        return 0.0
+        return self._coin_metrics(data, _COINS_BY_SYMBOL['ETH'])['change']
+    
+    def get_sol_price(self, data: dict) -> float:
+        return self._coin_metrics(data, _COINS_BY_SYMBOL['SOL'])['price']
+    
+    def get_sol_volume(self, data: dict) -> float:
+        return self._coin_metrics(data, _COINS_BY_SYMBOL['SOL'])['volume']
     
     def get_sol_change(self, data: dict) -> float:
-        live_data = data.get('live_exchange_data', {})
-        if 'binance' in live_data and 'SOLUSDT' in live_data['binance']:
-            return live_data['binance']['SOLUSDT']['change_24h']
-        return 0.0
+        return self._coin_metrics(data, _COINS_BY_SYMBOL['SOL'])['change']
+    
+    def get_xrp_price(self, data: dict) -> float:
+        return self._coin_metrics(data, _COINS_BY_SYMBOL['XRP'])['price']
+    
+    def get_xrp_volume(self, data: dict) -> float:
+        return self._coin_metrics(data, _COINS_BY_SYMBOL['XRP'])['volume']
     
     def get_xrp_change(self, data: dict) -> float:
-        live_data = data.get('live_exchange_data', {})
-        if 'binance' in live_data and 'XRPUSDT' in live_data['binance']:
-            return live_data['binance']['XRPUSDT']['change_24h']
-        return 0.0
+        return self._coin_metrics(data, _COINS_BY_SYMBOL['XRP'])['change']
 
 # Test the delivery methods
 if __name__ == "__main__":
@@ -258,7 +247,7 @@ if __name__ == "__main__":
             'sol_price': delivery.get_sol_price(test_data),
             'fear_greed': test_data.get('fear_greed_index', {}).get('value')
         }
-        print(json.dumps(payload, indent=2))
+        print(dump_json_pretty(payload).decode('utf-8'))
         
     except FileNotFoundError:
         print("❌ No test data found. Run test_agentceli.py first!")
\ No newline at end of file
@@ -4,31 +4,101 @@ Public API Server for AgentCeli
 CORS-enabled server for external website integration
 """
 
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request, Response, stream_with_context
 from flask_cors import CORS
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import hashlib
+import threading
+import time
 from pathlib import Path
+from agentceli_utils import OrjsonProvider, dump_json, load_json
 
 app = Flask(__name__)
+# OrjsonProvider is None without orjson - Flask's default provider stays active
+if OrjsonProvider is not None:
+    app.json = OrjsonProvider(app)
 CORS(app, origins=["*"])  # Allow all origins - configure as needed
 
 BASE_DIR = Path(__file__).parent
 
-def get_global_market_cap():
+def load_json_file(path):
+    """Parse a JSON file from raw bytes - no text decode step"""
+    return load_json(path.read_bytes())
+
+# path -> ((mtime_ns, size), parsed data); the files are rewritten in place by AgentCeli
+_PARSE_CACHE = {}
+_PARSE_CACHE_MAX = 4
+
+def load_json_cached(path):
+    """Parsed file contents, re-read only when mtime or size changed"""
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _PARSE_CACHE.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    
+    data = load_json_file(path)
+    if path not in _PARSE_CACHE and len(_PARSE_CACHE) >= _PARSE_CACHE_MAX:
+        _PARSE_CACHE.pop(next(iter(_PARSE_CACHE)), None)
+    _PARSE_CACHE[path] = (key, data)
+    return data
+
+# Outbound HTTP reuses one warm TLS connection pool
+_SESSION = requests.Session()
+_SESSION.headers['User-Agent'] = 'AgentCeli-PublicAPI/1.0'
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                                       max_retries=Retry(total=2, backoff_factor=0.1)))
+
+# One CoinGecko /global call serves all requests within the TTL
+GLOBAL_MARKET_CAP_TTL = 60
+_global_market_cap = {"t": float("-inf"), "v": None}
+_global_market_cap_lock = threading.Lock()
+
+def fetch_global_market_cap():
     """Get total cryptocurrency market cap from CoinGecko"""
     try:
-        response = requests.get(
+        response = _SESSION.get(
             "https://api.coingecko.com/api/v3/global",
             timeout=5
         )
         if response.status_code == 200:
             data = response.json()
             return data["data"]["total_market_cap"]["usd"]
-    except:
+    except (requests.RequestException, ValueError, KeyError):
         pass
     return None
 
+def get_global_market_cap():
+    """Total market cap, refreshed at most once per GLOBAL_MARKET_CAP_TTL"""
+    if time.monotonic() - _global_market_cap["t"] < GLOBAL_MARKET_CAP_TTL:
+        return _global_market_cap["v"]
+    
+    # Concurrent misses wait for the one in-flight fetch instead of all calling out
+    with _global_market_cap_lock:
+        if time.monotonic() - _global_market_cap["t"] >= GLOBAL_MARKET_CAP_TTL:
+            value = fetch_global_market_cap()
+            if value is not None:
+                _global_market_cap["v"] = value
+            # Failures also wait out the TTL - the last good value keeps being served
+            _global_market_cap["t"] = time.monotonic()
+        return _global_market_cap["v"]
+
+def iter_latest_response(response):
+    """Yield the /api/crypto/latest body section by section"""
+    market = response["market"]
+    yield (b'{"success":true,"source":"AgentCeli","timestamp":' + dump_json(response["timestamp"]) +
+           b',"prices":' + dump_json(response["prices"]))
+    yield (b',"market":{"fear_greed_index":' + dump_json(market["fear_greed_index"]) +
+           b',"fear_greed_label":' + dump_json(market["fear_greed_label"]) +
+           b',"total_crypto_market_cap":' + dump_json(market["total_crypto_market_cap"]) +
+           b',"individual_market_caps":{')
+    # One chunk per coin - this section grows with the number of tracked coins
+    for i, (symbol, market_cap) in enumerate(market["individual_market_caps"].items()):
+        yield (b',' if i else b'') + dump_json(symbol) + b':' + dump_json(market_cap)
+    yield b'},"agentceli_tracked_total":' + dump_json(market["agentceli_tracked_total"]) + b'}}'
+
 @app.route('/api/crypto/latest', methods=['GET'])
 def get_latest_crypto():
     """Get latest crypto data with CORS enabled"""
@@ -37,8 +107,7 @@ def get_latest_crypto():
         json_file = BASE_DIR / "correlation_data" / "hybrid_latest.json"
         
         if json_file.exists():
-            with open(json_file) as f:
-                data = json.load(f)
+            data = load_json_cached(json_file)
             
             # Simplified response for websites
             response = {
@@ -82,7 +151,9 @@ def get_latest_crypto():
                 }
             }
             
-            return jsonify(response)
+            # Everything that can fail is computed above, so the stream cannot break midway
+            return Response(stream_with_context(iter_latest_response(response)),
+                            mimetype='application/json')
         else:
             return jsonify({
                 "success": False,
@@ -102,10 +173,9 @@ def get_simple_prices():
         json_file = BASE_DIR / "correlation_data" / "hybrid_latest.json"
         
         if json_file.exists():
-            with open(json_file) as f:
-                data = json.load(f)
+            data = load_json_cached(json_file)
             
-            return jsonify({
+            payload = dump_json({
                 "btc": data["live_prices"]["binance"]["BTCUSDT"]["price"],
                 "eth": data["live_prices"]["binance"]["ETHUSDT"]["price"], 
                 "sol": data["live_prices"]["binance"]["SOLUSDT"]["price"],
@@ -113,6 +183,12 @@ def get_simple_prices():
                 "fear_greed": int(data["fear_greed"]["value"]),
                 "timestamp": data["timestamp"]
             })
+            
+            # Polling dashboards get an empty 304 until the snapshot changes
+            response = Response(payload, mimetype='application/json')
+            response.set_etag(hashlib.blake2b(payload, digest_size=8).hexdigest())
+            response.cache_control.max_age = 5
+            return response.make_conditional(request)
         else:
             return jsonify({"error": "No data"}), 404
             
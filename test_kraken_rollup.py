@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test Data Kraken rollup - raw rows past retention must be aggregated before they are pruned
+"""
+
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "templates"))
+from agentceli_kraken import AgentCeliKraken
+
+def make_kraken(db_path):
+    """Kraken with only the database wired up (no collector, no Flask server)"""
+    kraken = AgentCeliKraken.__new__(AgentCeliKraken)
+    kraken.db_path = db_path
+    kraken._tls = threading.local()
+    kraken.retention_days = 7
+    kraken.setup_database()
+    return kraken
+
+def test_first_rollup_keeps_history_older_than_retention(tmp_path):
+    """The first prune on an upgraded DB must roll up old raw rows instead of dropping them"""
+    kraken = make_kraken(tmp_path / "crypto_timeseries.db")
+    hour = datetime(2025, 7, 20, 12)
+    hour_start = int(hour.timestamp())
+    old_hour = hour_start - 10 * 86400  # older than the 7 day retention window
+    recent_hour = hour_start - 3600
+    
+    conn = kraken._conn()
+    conn.executemany(
+        'INSERT INTO price_history (timestamp, symbol, price_usd) VALUES (?, ?, ?)',
+        [(old_hour + 60, 'BTC', 100.0), (old_hour + 120, 'BTC', 200.0), (recent_hour + 60, 'BTC', 300.0)]
+    )
+    
+    kraken.rollup_and_prune(hour)
+    
+    check = sqlite3.connect(kraken.db_path)
+    hourly = check.execute(
+        'SELECT hour, symbol, price_usd, samples FROM price_history_hourly ORDER BY hour'
+    ).fetchall()
+    raw = check.execute('SELECT timestamp FROM price_history').fetchall()
+    check.close()
+    
+    assert hourly == [(old_hour, 'BTC', 150.0, 2), (recent_hour, 'BTC', 300.0, 1)]
+    assert raw == [(recent_hour + 60,)]
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test /api/register validation - the msgspec path and the stdlib fallback must agree
+"""
+
+import pytest
+
+import client_connection_manager
+
+VALID_BODIES = [
+    b'{"client_id": "site", "name": "Website", "type": "api"}',
+    b'{"client_id": "hook", "name": "Hook", "type": "webhook", "webhook_url": "https://example.com", "api_key": null}',
+]
+
+INVALID_BODIES = [
+    b'{not json',
+    b'[1, 2]',
+    b'"client"',
+    b'null',
+    b'{"name": "Website", "type": "api"}',
+    b'{"client_id": 42, "name": "Website", "type": "api"}',
+    b'{"client_id": "site", "name": ["Website"], "type": "api"}',
+    b'{"client_id": "site", "name": "Website", "type": "api", "endpoint": 8080}',
+    b'{"client_id": "site", "name": "Website", "type": "api", "api_key": true}',
+]
+
+def parse_with_fallback(body):
+    """parse_register_request as it runs without msgspec installed"""
+    msgspec = client_connection_manager.msgspec
+    client_connection_manager.msgspec = None
+    try:
+        return client_connection_manager.parse_register_request(body)
+    finally:
+        client_connection_manager.msgspec = msgspec
+
+@pytest.mark.parametrize('body', INVALID_BODIES)
+def test_fallback_rejects_invalid_bodies(body):
+    fields, error = parse_with_fallback(body)
+    assert fields is None and error
+
+@pytest.mark.parametrize('body', VALID_BODIES)
+def test_fallback_accepts_valid_bodies(body):
+    fields, error = parse_with_fallback(body)
+    assert error is None and fields['client_id']
+
+@pytest.mark.parametrize('body', VALID_BODIES + INVALID_BODIES)
+def test_msgspec_and_fallback_agree(body):
+    if client_connection_manager.msgspec is None:
+        pytest.skip('msgspec not installed')
+    assert client_connection_manager.parse_register_request(body) == parse_with_fallback(body)